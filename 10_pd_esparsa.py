@@ -0,0 +1,69 @@
+"""
+Programação Dinâmica esparsa (fronteira de Pareto) para a mochila 0/1.
+
+Em vez de um vetor dp[0..W], mantém apenas os estados (peso, valor) não
+dominados: listas paralelas ordenadas por peso crescente com valores
+estritamente crescentes. Cada item gera uma cópia deslocada da fronteira,
+que é intercalada com a original em tempo linear, descartando estados
+dominados e estados com peso acima de W (knapsack_pareto.merge, a mesma
+intercalação de 5_meet_in_middle.py e 9_core.py).
+
+Tempo e memória são proporcionais ao tamanho da fronteira, e não à
+capacidade; quando os pesos são grandes e esparsos, a fronteira fica muito
+menor que W.
+
+Fornece `knapsack(W, val, wt)` e `knapsack_with_items(W, val, wt)`. A
+contagem de operações (estados gerados) é feita em bloco, uma vez por item,
+num `counter` (knapsack_instrument.OpCounter) opcional.
+"""
+from bisect import bisect_right
+
+from knapsack_pareto import merge, items
+
+
+def _add(W, ws, vs, ds, wi, vi, item, counter=None):
+	# Aplica o item à fronteira (knapsack_pareto.merge), contando os estados
+	# visitados: toda a fronteira e a parte da cópia deslocada que cabe
+	if counter is not None:
+		counter.add(len(ws) + bisect_right(ws, W - wi))
+	return merge(ws, vs, ds, wi, vi, item, W)
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""
+	Retorna (max_value, chosen_indices) com índices em ordem crescente. Cada
+	estado guarda um ponteiro para o estado de onde veio, então a
+	reconstrução não exige tabela.
+	"""
+	ws, vs, ds = [0], [0], [None]
+	for i in range(len(val)):
+		if wt[i] > W or val[i] <= 0:
+			continue
+		ws, vs, ds = _add(W, ws, vs, ds, wt[i], val[i], i, counter)
+
+	# O último estado da fronteira é o de maior valor
+	return vs[-1], items(ds[-1])
+
+
+def knapsack(W, val, wt, counter=None):
+	"""Retorna apenas o valor máximo (int), sem acompanhar a reconstrução."""
+	ws, vs = [0], [0]
+	for i in range(len(val)):
+		if wt[i] > W or val[i] <= 0:
+			continue
+		ws, vs, _ = _add(W, ws, vs, None, wt[i], val[i], i, counter)
+	return vs[-1]
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import run
+
+	# Exemplo de demonstração
+	val = [1, 2, 3]
+	wt = [4, 5, 1]
+	W = 4
+
+	result = run(knapsack_with_items, W, val, wt)
+	print(f"Valor máximo: {result.value}")
+	print(f"Índices dos itens escolhidos: {result.chosen}")
+	print(f"Operações: {result.ops}")
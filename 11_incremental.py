@@ -0,0 +1,140 @@
+"""
+Solver incremental para a mochila 0/1 com catálogo que muda com o tempo.
+
+`KnapsackSolver` mantém uma pilha de linhas da PD: a linha k é o vetor
+dp[0..capacidade] usando os k primeiros itens da pilha. Assim:
+
+- `add_item` empilha uma linha nova calculada a partir do topo: O(W);
+- `remove_item` desfaz a pilha até o item removido e reaplica os itens que
+  estavam acima dele (estratégia de undo): O(W) para o item mais recente e
+  O(k x W) para um item com k itens acima;
+- `solve(c)` responde qualquer capacidade c <= capacidade sem recalcular
+  nada: o valor é lido da linha do topo e os itens saem comparando linhas
+  consecutivas em O(n);
+- `set_capacity` só refaz as linhas quando a capacidade aumenta.
+
+Também fornece `knapsack(W, val, wt)` e `knapsack_with_items(W, val, wt)`.
+As células calculadas são somadas, uma vez por linha, no `counter`
+(knapsack_instrument.OpCounter) opcional do solver.
+"""
+
+
+class KnapsackSolver:
+	"""
+	Mochila 0/1 com itens adicionados/removidos ao longo do tempo. Cada item
+	recebe um id estável (inteiro crescente) retornado por `add_item` e usado
+	em `remove_item` e na lista de escolhidos de `solve`. Com `counter`, as
+	células calculadas por todas as operações são acumuladas nele.
+	"""
+
+	def __init__(self, capacity, items=(), counter=None):
+		self.capacity = capacity
+		self.counter = counter
+		self._next_id = 0
+		# pilha de itens (id, peso, valor) e de linhas da PD (rows[0] = vazio)
+		self._items = []
+		self._rows = [[0] * (capacity + 1)]
+		for w, v in items:
+			self.add_item(w, v)
+
+	def __len__(self):
+		return len(self._items)
+
+	def _push(self, item):
+		_, w, v = item
+		prev = self._rows[-1]
+		if w > self.capacity:
+			row = prev
+		else:
+			if self.counter is not None:
+				self.counter.add(self.capacity - w + 1)
+			# dp novo em j >= w: max(dp[j], dp[j - w] + v); abaixo de w não muda
+			row = prev[:w] + [a if a >= b + v else b + v for a, b in zip(prev[w:], prev)]
+		self._items.append(item)
+		self._rows.append(row)
+
+	def add_item(self, w, v):
+		"""Adiciona um item (peso w, valor v) e retorna seu id."""
+		item_id = self._next_id
+		self._next_id += 1
+		self._push((item_id, w, v))
+		return item_id
+
+	def remove_item(self, item_id):
+		"""Remove o item `item_id`; levanta KeyError se ele não existir."""
+		for pos in range(len(self._items) - 1, -1, -1):
+			if self._items[pos][0] == item_id:
+				break
+		else:
+			raise KeyError(item_id)
+
+		# Desfaz até o item e reaplica os que estavam acima dele
+		redo = self._items[pos + 1:]
+		del self._items[pos:]
+		del self._rows[pos + 1:]
+		for item in redo:
+			self._push(item)
+
+	def set_capacity(self, capacity):
+		"""
+		Muda a capacidade máxima. Diminuir só restringe as consultas; aumentar
+		recalcula as linhas de todos os itens.
+		"""
+		if capacity <= self.capacity:
+			self.capacity = capacity
+			self._rows = [row[:capacity + 1] for row in self._rows]
+			return
+		items = self._items
+		self.capacity = capacity
+		self._items = []
+		self._rows = [[0] * (capacity + 1)]
+		for item in items:
+			self._push(item)
+
+	def solve(self, capacity=None):
+		"""
+		Retorna (max_value, chosen_ids) para `capacity` (padrão: a capacidade
+		atual), com ids em ordem de inserção.
+		"""
+		c = self.capacity if capacity is None else capacity
+		if not 0 <= c <= self.capacity:
+			raise ValueError(f"capacidade {c} fora de [0, {self.capacity}]")
+
+		value = self._rows[-1][c]
+		chosen = []
+		for k in range(len(self._items), 0, -1):
+			# o item k-1 foi pego se a linha mudou ao incluí-lo
+			if self._rows[k][c] != self._rows[k - 1][c]:
+				item_id, w, _ = self._items[k - 1]
+				chosen.append(item_id)
+				c -= w
+		chosen.reverse()
+		return value, chosen
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""Retorna (max_value, chosen_indices) montando um solver com todos os itens."""
+	solver = KnapsackSolver(W, zip(wt, val), counter)
+	return solver.solve()
+
+
+def knapsack(W, val, wt, counter=None):
+	"""Wrapper de compatibilidade que retorna apenas o valor máximo (int)."""
+	max_val, _ = knapsack_with_items(W, val, wt, counter=counter)
+	return max_val
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import OpCounter
+
+	# Exemplo de demonstração
+	solver = KnapsackSolver(4, counter=OpCounter())
+	a = solver.add_item(4, 1)
+	b = solver.add_item(5, 2)
+	c = solver.add_item(1, 3)
+	print(f"Solução inicial: {solver.solve()}")
+	solver.remove_item(c)
+	print(f"Após remover o item {c}: {solver.solve()}")
+	solver.set_capacity(6)
+	print(f"Com capacidade 6: {solver.solve()}")
+	print(f"Operações: {solver.counter.ops}")
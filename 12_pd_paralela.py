@@ -0,0 +1,217 @@
+# [PD Paralela] PD Bottom-Up dividida por faixas de capacidade - O(n x W / p) Tempo e O(W) Espaço
+#
+# Na atualização de um item, cada célula j em [wt, W] depende apenas da linha
+# anterior, então faixas de capacidade podem ser calculadas independentemente.
+# Duas linhas (buffer duplo) ficam em memória compartilhada
+# (`multiprocessing.shared_memory`): os trabalhadores leem a linha anterior e
+# escrevem sua faixa na linha nova; ao fim de cada item as linhas trocam de
+# papel. Requer `numpy`.
+#
+# Backends:
+# - 'process': processos persistentes (um por faixa) criados com fork na
+#              primeira chamada e reaproveitados nas seguintes (`shutdown()`
+#              os encerra); em plataformas sem fork cai para threads
+# - 'thread':  threads sobre fatias numpy (as ufuncs liberam o GIL)
+#
+# Com uma única faixa (W + 1 < 2 * MIN_CHUNK ou um trabalhador) a varredura
+# roda no próprio processo, sem trabalhadores nem memória compartilhada.
+#
+# Contagem de operações (atualizações na tabela): passe um `counter`
+# (knapsack_instrument.OpCounter); o total sai direto dos pesos.
+
+import os
+import atexit
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
+
+# Faixas menores que isso não compensam o custo de sincronização
+MIN_CHUNK = 1 << 16
+
+def _sweep(old, new, tmp, w, v, lo, hi):
+    # new[lo:hi] a partir de old: cópia abaixo de w, max(old[j], old[j-w]+v) acima
+    a = min(max(lo, w), hi)
+    if lo < a:
+        new[lo:a] = old[lo:a]
+    if a < hi:
+        import numpy as np
+        k = hi - a
+        np.add(old[a - w:hi - w], v, out=tmp[:k])
+        np.maximum(old[a:hi], tmp[:k], out=new[a:hi])
+
+def _rows(shm, W):
+    import numpy as np
+    return np.ndarray((2, W + 1), dtype=np.int64, buffer=shm.buf)
+
+def _worker(conn):
+    # Atende várias chamadas: 'open' anexa o buffer duplo da chamada, 'sweep'
+    # calcula uma faixa e 'close' solta o buffer; None encerra
+    import numpy as np
+    shm = rows = tmp = None
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        if msg[0] == 'open':
+            _, shm_name, W, size = msg
+            shm = shared_memory.SharedMemory(name=shm_name)
+            rows = _rows(shm, W)
+            tmp = np.empty(size, dtype=np.int64)
+        elif msg[0] == 'close':
+            rows = tmp = None
+            shm.close()
+            shm = None
+        else:
+            _, src, w, v, lo, hi = msg
+            _sweep(rows[src], rows[1 - src], tmp, w, v, lo, hi)
+        conn.send(True)
+
+# Trabalhadores persistentes do backend 'process': (conexão, processo), do
+# processo de id _POOL_PID; o lock serializa chamadas de threads diferentes
+_POOL = []
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+
+def _pool(count):
+    global _POOL_PID
+    if _POOL_PID != os.getpid():
+        # Trabalhadores herdados por fork pertencem ao processo pai
+        _POOL.clear()
+        _POOL_PID = os.getpid()
+    ctx = multiprocessing.get_context('fork')
+    while len(_POOL) < count:
+        parent, child = ctx.Pipe()
+        p = ctx.Process(target=_worker, args=(child,), daemon=True)
+        p.start()
+        child.close()
+        _POOL.append((parent, p))
+    return [conn for conn, _ in _POOL[:count]]
+
+def shutdown():
+    """Encerra os processos persistentes do backend 'process'."""
+    if _POOL_PID != os.getpid():
+        return
+    for conn, _ in _POOL:
+        try:
+            conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+    for conn, p in _POOL:
+        p.join(timeout=5)
+        if p.is_alive():
+            p.kill()
+        conn.close()
+    _POOL.clear()
+
+atexit.register(shutdown)
+
+def _broadcast(conns, msgs):
+    for conn, msg in zip(conns, msgs):
+        conn.send(msg)
+    # barreira: retorna só quando todos os trabalhadores responderam
+    for conn in conns:
+        conn.recv()
+
+def _chunks(W, workers):
+    count = max(1, min(workers, (W + 1 + MIN_CHUNK - 1) // MIN_CHUNK))
+    step = (W + 1 + count - 1) // count
+    return [(lo, min(lo + step, W + 1)) for lo in range(0, W + 1, step)]
+
+def _run_processes(W, val, wt, rows, shm, chunks):
+    size = max(hi - lo for lo, hi in chunks)
+    with _POOL_LOCK:
+        conns = _pool(len(chunks))
+        try:
+            _broadcast(conns, [('open', shm.name, W, size)] * len(conns))
+            src = 0
+            for i in range(len(wt)):
+                w = int(wt[i])
+                v = int(val[i])
+                if w > W:
+                    continue
+                _broadcast(conns, [('sweep', src, w, v, lo, hi) for lo, hi in chunks])
+                src = 1 - src
+            _broadcast(conns, [('close',)] * len(conns))
+            return int(rows[src][W])
+        except BaseException:
+            # Trabalhadores em estado desconhecido não são reaproveitados
+            shutdown()
+            raise
+
+def _run_inline(W, val, wt):
+    import numpy as np
+    rows = np.zeros((2, W + 1), dtype=np.int64)
+    tmp = np.empty(W + 1, dtype=np.int64)
+    src = 0
+    for i in range(len(wt)):
+        w = int(wt[i])
+        v = int(val[i])
+        if w > W:
+            continue
+        _sweep(rows[src], rows[1 - src], tmp, w, v, 0, W + 1)
+        src = 1 - src
+    return int(rows[src][W])
+
+def _run_threads(W, val, wt, rows, chunks, pool):
+    import numpy as np
+    tmps = [np.empty(hi - lo, dtype=np.int64) for lo, hi in chunks]
+    src = 0
+    for i in range(len(wt)):
+        w = int(wt[i])
+        v = int(val[i])
+        if w > W:
+            continue
+        futures = [pool.submit(_sweep, rows[src], rows[1 - src], tmp, w, v, lo, hi)
+                   for tmp, (lo, hi) in zip(tmps, chunks)]
+        for f in futures:
+            f.result()
+        src = 1 - src
+    return int(rows[src][W])
+
+def knapsack(W, val, wt, workers=None, backend='process', counter=None):
+    """
+    Mesma PD de 2_pd.knapsack, com cada item varrido em paralelo por
+    `workers` trabalhadores (padrão: número de CPUs), cada um responsável
+    por uma faixa contígua de capacidades.
+    """
+    if counter is not None:
+        counter.add(sum(W - int(w) + 1 for w in wt if w <= W))
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(W, workers)
+    if backend not in ('process', 'thread'):
+        raise ValueError(f"backend desconhecido: {backend!r}")
+    if len(chunks) == 1:
+        return _run_inline(W, val, wt)
+
+    if backend == 'process' and 'fork' not in multiprocessing.get_all_start_methods():
+        backend = 'thread'
+
+    if backend == 'thread':
+        import numpy as np
+        rows = np.zeros((2, W + 1), dtype=np.int64)
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            return _run_threads(W, val, wt, rows, chunks, pool)
+
+    shm = shared_memory.SharedMemory(create=True, size=2 * (W + 1) * 8)
+    try:
+        rows = _rows(shm, W)
+        rows[:] = 0
+        try:
+            return _run_processes(W, val, wt, rows, shm, chunks)
+        finally:
+            del rows
+    finally:
+        shm.close()
+        shm.unlink()
+
+if __name__ == "__main__":
+    from knapsack_instrument import run
+
+    val = [1, 2, 3]
+    wt = [4, 5, 1]
+    W = 4
+
+    result = run(knapsack, W, val, wt, workers=2)
+    print(result.value)
+    print(f"Operações: {result.ops}")
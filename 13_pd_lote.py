@@ -0,0 +1,156 @@
+"""
+PD em lote: muitas instâncias pequenas da mochila 0/1 numa única passada
+vetorizada.
+
+Para instâncias como input_5.json…input_32.json (n <= 32, W <= 100), o custo
+de `2_pd.knapsack` é dominado pela sobrecarga de cada chamada em Python, e
+não pela PD. Aqui as instâncias são empilhadas num array NumPy 2-D
+(instâncias x capacidades) e todas as linhas da PD avançam juntas, um
+"slot" de item por vez:
+
+- cada linha tem à esquerda W+1 colunas de sentinela muito negativa; com uma
+  janela deslizante (`sliding_window_view`), a linha deslocada pelo peso do
+  item de cada instância é copiada por indexação avançada (uma cópia
+  contígua por linha, sem gather elemento a elemento);
+- máscaras: instâncias com menos itens recebem slots de peso W+1, que só
+  enxergam a sentinela e nunca são escolhidos; instâncias com capacidade
+  menor leem a resposta na própria coluna W (as colunas acima não
+  influenciam as de baixo);
+- as instâncias são ordenadas por (n, W) e resolvidas em blocos, de modo que
+  cada bloco tem largura e número de slots próximos dos seus; os valores
+  usam int32 quando a soma dos valores de cada instância cabe.
+
+Com `with_items=True` a comparação de cada slot é guardada (bool, um byte por
+célula) e os itens de todas as instâncias do bloco são reconstruídos juntos.
+
+Fornece:
+- `knapsack_batch(instances, with_items=False)` -> lista de valores (ou de
+  (valor, indices_escolhidos)), na ordem de `instances`, uma sequência de
+  (W, val, wt);
+- `knapsack(W, val, wt)` e `knapsack_with_items(W, val, wt)` para uma
+  instância (um lote de tamanho 1), pela API dos demais módulos.
+
+Requer `numpy`. A contagem de operações soma as células efetivamente
+processadas, incluindo o preenchimento (uma vez por bloco), num `counter`
+(knapsack_instrument.OpCounter) opcional.
+"""
+from itertools import chain
+
+# Instâncias por bloco e limite de células (instâncias x capacidades) de um
+# bloco: blocos menores cabem na cache, maiores amortizam as chamadas NumPy
+CHUNK_SIZE = 512
+MAX_CELLS = 1 << 17
+
+# Somas de valores abaixo disso usam int32 (a sentinela -2^30 somada a um
+# valor não transborda)
+_INT32_LIMIT = 1 << 30
+
+
+def _solve_chunk(instances, with_items, counter=None):
+	import numpy as np
+
+	B = len(instances)
+	caps = np.fromiter((W for W, _, _ in instances), dtype=np.int64, count=B)
+	lens = np.fromiter((len(v) for _, v, _ in instances), dtype=np.int64, count=B)
+	n = int(lens.max())
+	C = int(caps.max()) + 1
+	if counter is not None:
+		counter.add(B * C * n)
+
+	# Slots além do n de cada instância ficam com peso C (só sentinela)
+	present = np.arange(n)[None, :] < lens[:, None]
+	total = int(lens.sum())
+	wt = np.full((B, n), C, dtype=np.int64)
+	val = np.zeros((B, n), dtype=np.int64)
+	wt[present] = np.fromiter(chain.from_iterable(w for _, _, w in instances), dtype=np.int64, count=total)
+	val[present] = np.fromiter(chain.from_iterable(v for _, v, _ in instances), dtype=np.int64, count=total)
+	# Itens de peso acima de W nunca cabem; valores <= 0 nunca melhoram
+	np.minimum(wt, C, out=wt)
+	np.maximum(val, 0, out=val)
+
+	dtype = np.int32 if int(val.sum(axis=1).max()) < _INT32_LIMIT else np.int64
+	sentinel = -_INT32_LIMIT if dtype is np.int32 else -(1 << 62)
+	val = val.astype(dtype)
+
+	# pad[b] = [sentinela x C | dp[b][0..C-1]]; a janela que começa em C - w
+	# é a linha dp deslocada w posições para a direita
+	pad = np.zeros((B, 2 * C), dtype=dtype)
+	pad[:, :C] = sentinel
+	dp = pad[:, C:]
+	windows = np.lib.stride_tricks.sliding_window_view(pad, C, axis=1)
+	rows = np.arange(B)
+	start = C - wt
+
+	decisions = [] if with_items else None
+	for i in range(n):
+		cand = windows[rows, start[:, i]]
+		cand += val[:, i:i + 1]
+		if with_items:
+			decisions.append(cand > dp)
+		np.maximum(dp, cand, out=dp)
+
+	values = dp[rows, caps].tolist()
+	if not with_items:
+		return values
+
+	# Reconstrução de todas as instâncias ao mesmo tempo, do último slot ao primeiro
+	c = caps.copy()
+	taken = np.zeros((B, n), dtype=bool)
+	for i in range(n - 1, -1, -1):
+		bit = decisions[i][rows, c]
+		taken[:, i] = bit
+		c -= np.where(bit, wt[:, i], 0)
+	return [(value, np.flatnonzero(row).tolist()) for value, row in zip(values, taken)]
+
+
+def knapsack_batch(instances, with_items=False, chunk_size=CHUNK_SIZE, counter=None):
+	"""
+	Resolve cada (W, val, wt) de `instances` e retorna, na mesma ordem, o
+	valor ótimo de cada uma ou, com `with_items`, pares (valor, índices
+	escolhidos em ordem crescente).
+	"""
+	instances = list(instances)
+	# Ordena por (n, W) para que cada bloco desperdice pouco preenchimento
+	order = sorted(range(len(instances)), key=lambda k: (len(instances[k][1]), instances[k][0]))
+	results = [None] * len(instances)
+	pos = 0
+	while pos < len(order):
+		# Bloco limitado em instâncias e em células (largura da maior capacidade)
+		end = min(pos + chunk_size, len(order))
+		widest = max(instances[k][0] for k in order[pos:end]) + 1
+		end = min(end, pos + max(1, MAX_CELLS // widest))
+		part = order[pos:end]
+		solved = _solve_chunk([instances[k] for k in part], with_items, counter)
+		for k, res in zip(part, solved):
+			results[k] = res
+		pos = end
+	return results
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""Retorna (max_value, chosen_indices) para uma instância."""
+	return knapsack_batch([(W, val, wt)], with_items=True, counter=counter)[0]
+
+
+def knapsack(W, val, wt, counter=None):
+	"""Retorna apenas o valor máximo (int) para uma instância."""
+	return knapsack_batch([(W, val, wt)], counter=counter)[0]
+
+
+if __name__ == '__main__':
+	import random
+	import time
+
+	# Exemplo de demonstração: 10 000 instâncias pequenas num único lote
+	rng = random.Random(0)
+	instances = []
+	for _ in range(10000):
+		n = rng.randint(5, 32)
+		instances.append((rng.randint(10, 100), [rng.randint(1, 100) for _ in range(n)],
+		                  [rng.randint(1, 20) for _ in range(n)]))
+
+	t0 = time.perf_counter()
+	results = knapsack_batch(instances, with_items=True)
+	elapsed = time.perf_counter() - t0
+	print(f"{len(instances)} instâncias em {elapsed:.3f}s ({len(instances) / elapsed:.0f} instâncias/s)")
+	print(f"Primeira instância: valor {results[0][0]}, itens {results[0][1]}")
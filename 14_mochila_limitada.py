@@ -0,0 +1,206 @@
+"""
+Mochila limitada: cada item i tem cnt[i] cópias idênticas.
+
+Listar cada cópia como um item separado multiplica o n de 2_pd.py e
+4_pd_com_itens.py pelo número de cópias. Aqui cada item distinto é
+processado uma única vez, em O(W), com a técnica da fila monotônica (máximo
+em janela deslizante): para cada resto r módulo w, as capacidades
+r, r + w, r + 2w, ... formam uma sequência em que
+
+    novo[r + t*w] = max_{t - c <= s <= t} (dp[r + s*w] - s*v) + t*v
+
+e o máximo da janela de tamanho c + 1 sai da frente de uma deque com
+valores decrescentes. O total é O(n x W) para n itens distintos, qualquer
+que seja o número de cópias. Itens com uma cópia usam o laço 0/1 e itens
+com cópias suficientes para encher a mochila usam o laço ilimitado.
+
+A reconstrução tem dois modos (parâmetro `method`):
+- 'split' (padrão): divisão binária; cada item vira partes de 1, 2, 4, ...
+  cópias (mais o resto), resolvidas como mochila 0/1 por
+  2_pd.knapsack_all_capacities com o bitmap de decisões: O(W x Σ log c)
+  tempo e (W + 1) bits por parte;
+- 'queue': a própria fila monotônica guarda quantas cópias cada capacidade
+  usou (O(n x W) tempo, um inteiro pequeno por célula).
+
+Fornece:
+- `knapsack(W, val, wt, cnt)` -> valor máximo (int)
+- `knapsack_with_quantities(W, val, wt, cnt)` -> (valor, quantidades), com
+  quantidades[i] = cópias do item i na solução
+- `knapsack_with_items(W, val, wt, cnt)` -> (valor, indices_escolhidos), com o
+  índice i repetido quantidades[i] vezes
+
+Sem `cnt`, cada item tem uma cópia (mochila 0/1). A contagem de operações
+(células visitadas) é somada uma vez por item num `counter`
+(knapsack_instrument.OpCounter) opcional.
+"""
+from array import array
+from collections import deque
+
+import knapsack_registry
+
+
+def _counts(val, cnt):
+	if cnt is None:
+		return [1] * len(val)
+	if len(cnt) != len(val):
+		raise ValueError('cnt deve ter um valor por item')
+	if any(c < 0 for c in cnt):
+		raise ValueError('as quantidades devem ser não negativas')
+	return cnt
+
+
+def _typecode(c):
+	# Menor tipo de array que guarda 0..c
+	for code in ('B', 'H', 'L', 'Q'):
+		if c < 1 << (8 * array(code).itemsize):
+			return code
+	raise OverflowError(f"quantidade grande demais: {c}")
+
+
+def _add_item(dp, W, w, v, c, copies=None):
+	"""
+	Atualiza dp (in-place) com c cópias de (w, v). Quando `copies` é um array
+	de W + 1 posições, copies[j] recebe quantas cópias a capacidade j usou.
+	"""
+	if w == 0:
+		# Cópias de peso zero cabem todas
+		if copies is not None and v > 0:
+			for j in range(W + 1):
+				copies[j] = c
+		if v > 0:
+			for j in range(W + 1):
+				dp[j] += c * v
+		return
+
+	if c == 1:
+		# Laço 0/1 (capacidades decrescentes)
+		for j in range(W, w - 1, -1):
+			cand = dp[j - w] + v
+			if cand > dp[j]:
+				dp[j] = cand
+				if copies is not None:
+					copies[j] = 1
+		return
+
+	if c * w >= W:
+		# Cópias suficientes para encher a mochila: laço ilimitado (crescente)
+		for j in range(w, W + 1):
+			cand = dp[j - w] + v
+			if cand > dp[j]:
+				dp[j] = cand
+				if copies is not None:
+					copies[j] = copies[j - w] + 1
+		return
+
+	for r in range(w):
+		old = dp[r::w]
+		new = [0] * len(old)
+		# Janela (s, dp[r + s*w] - s*v) com o segundo campo decrescente
+		window = deque()
+		for t, x in enumerate(old):
+			g = x - t * v
+			while window and window[-1][1] < g:
+				window.pop()
+			window.append((t, g))
+			if window[0][0] < t - c:
+				window.popleft()
+			s, best = window[0]
+			new[t] = best + t * v
+			if copies is not None:
+				copies[r + t * w] = t - s
+		dp[r::w] = new
+
+
+def knapsack(W, val, wt, cnt=None, counter=None):
+	"""Retorna apenas o valor máximo (int)."""
+	cnt = _counts(val, cnt)
+	dp = [0] * (W + 1)
+	for i in range(len(val)):
+		if wt[i] > W or cnt[i] == 0 or val[i] <= 0:
+			continue
+		if counter is not None:
+			counter.add(W + 1)
+		_add_item(dp, W, wt[i], val[i], cnt[i])
+	return dp[W]
+
+
+def _split_quantities(W, val, wt, cnt, counter=None):
+	# Divisão binária: partes de 1, 2, 4, ... cópias e o resto
+	pv, pw, owner, size = [], [], [], []
+	for i in range(len(val)):
+		if wt[i] > W or val[i] <= 0:
+			continue
+		left = cnt[i] if wt[i] == 0 else min(cnt[i], W // wt[i])
+		k = 1
+		while left > 0:
+			s = min(k, left)
+			pv.append(s * val[i])
+			pw.append(s * wt[i])
+			owner.append(i)
+			size.append(s)
+			left -= s
+			k <<= 1
+
+	mod2 = knapsack_registry.load('dp')
+	best, decisions = mod2.knapsack_all_capacities(W, pv, pw, keep_decisions=True, counter=counter)
+	quantities = [0] * len(val)
+	for p in mod2.backtrack(decisions, pw, W):
+		quantities[owner[p]] += size[p]
+	return best[W], quantities
+
+
+def _queue_quantities(W, val, wt, cnt, counter=None):
+	dp = [0] * (W + 1)
+	rows = []  # (item, copies por capacidade)
+	for i in range(len(val)):
+		if wt[i] > W or cnt[i] == 0 or val[i] <= 0:
+			continue
+		if counter is not None:
+			counter.add(W + 1)
+		copies = array(_typecode(cnt[i]), [0]) * (W + 1)
+		_add_item(dp, W, wt[i], val[i], cnt[i], copies)
+		rows.append((i, copies))
+
+	quantities = [0] * len(val)
+	c = W
+	for i, copies in reversed(rows):
+		quantities[i] = copies[c]
+		c -= copies[c] * wt[i]
+	return dp[W], quantities
+
+
+def knapsack_with_quantities(W, val, wt, cnt=None, method='split', counter=None):
+	"""
+	Retorna (max_value, quantities), com quantities[i] = cópias do item i
+	usadas numa solução ótima.
+	"""
+	cnt = _counts(val, cnt)
+	if method == 'split':
+		return _split_quantities(W, val, wt, cnt, counter)
+	if method == 'queue':
+		return _queue_quantities(W, val, wt, cnt, counter)
+	raise ValueError(f"método desconhecido: {method!r}")
+
+
+def knapsack_with_items(W, val, wt, cnt=None, method='split', counter=None):
+	"""
+	Retorna (max_value, chosen_indices) em ordem crescente, com cada índice
+	repetido tantas vezes quantas cópias foram escolhidas.
+	"""
+	value, quantities = knapsack_with_quantities(W, val, wt, cnt, method, counter)
+	return value, [i for i, q in enumerate(quantities) for _ in range(q)]
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import run
+
+	# Exemplo de demonstração: 3 itens distintos com várias cópias cada
+	val = [10, 40, 30]
+	wt = [5, 4, 6]
+	cnt = [3, 1, 2]
+	W = 20
+
+	result = run(knapsack, W, val, wt, cnt=cnt)
+	print(f"Valor máximo: {result.value} (operações: {result.ops})")
+	value, quantities = knapsack_with_quantities(W, val, wt, cnt)
+	print(f"Quantidades escolhidas por item: {quantities}")
@@ -0,0 +1,136 @@
+"""
+Solver "anytime" com prazo para a mochila 0/1.
+
+Com um orçamento de latência por requisição, hoje é preciso escolher de
+antemão entre o guloso (rápido, inexato) e as PDs exatas (tempo sem limite).
+Este solver faz as duas coisas, em fases:
+
+1. guloso em tempo linear (3_greed, mode='critical'): max(prefixo guloso,
+   melhor item isolado), uma 1/2-aproximação, junto com o limite superior
+   fracionário de Dantzig, ambos de uma única busca do item crítico
+   (3_greed.critical_split), reaproveitada pelo núcleo;
+2. melhora a solução incumbente com o núcleo expansível de 9_core.py
+   (PD esparsa com poda por limites), uma rodada por vez: cada rodada pode
+   aumentar o valor da incumbente e baixar o limite superior provado;
+3. para quando o limite superior iguala a incumbente (ótimo provado) ou
+   quando o prazo vence, devolvendo a melhor solução encontrada.
+
+A fase gulosa roda sempre, para haver uma resposta. Montar o núcleo custa
+O(n), como ela, então o núcleo só começa se o tempo restante cobre o que a
+fase gulosa levou; depois, o prazo é verificado entre as rodadas, que custam
+O(estados vivos) cada. O atraso após o prazo fica em torno de uma rodada
+(mais a diferença entre a montagem e a fase gulosa).
+
+Fornece:
+- `knapsack_anytime(W, val, wt, time_limit, deadline, on_progress)` ->
+  dicionário com a solução, o limite superior e o gap de otimalidade;
+  `on_progress(resultado)` é chamado a cada melhora (valor ou limite)
+- `knapsack(W, val, wt, time_limit)` -> valor (int)
+- `knapsack_with_items(W, val, wt, time_limit)` -> (valor, indices_escolhidos)
+
+Sem prazo, o solver roda até provar o ótimo (é exato). Todas aceitam um
+`counter` (knapsack_instrument.OpCounter) opcional, repassado ao guloso e
+ao núcleo, que contam em bloco.
+"""
+import time
+
+import knapsack_registry
+
+
+def _gaps(result):
+	upper = result['upper_bound']
+	gap = upper - result['value']
+	result['gap'] = gap
+	result['rel_gap'] = gap / upper if upper > 0 else 0.0
+	result['optimal'] = gap <= 0
+
+
+def knapsack_anytime(W, val, wt, time_limit=None, deadline=None, on_progress=None, counter=None):
+	"""
+	Retorna a melhor solução encontrada até o prazo, como um dicionário:
+
+	value, chosen:  valor e índices (ordem crescente) da solução incumbente
+	upper_bound:    limite superior provado para o ótimo
+	gap, rel_gap:   upper_bound - value e (upper_bound - value) / upper_bound
+	optimal:        True quando o gap é zero (ótimo provado)
+	phase:          'greedy' ou 'core', a fase que produziu a incumbente
+	rounds:         rodadas do núcleo executadas
+	elapsed:        segundos desde o início
+
+	`time_limit` é relativo ao início (segundos); `deadline` é absoluto, em
+	`time.monotonic()`. Sem nenhum dos dois, roda até provar o ótimo.
+	"""
+	start = time.monotonic()
+	if deadline is None and time_limit is not None:
+		deadline = start + time_limit
+
+	greed = knapsack_registry.load('greedy')
+	core = knapsack_registry.load('core')
+
+	split = greed.critical_split(W, val, wt, counter)
+	value, chosen = greed.knapsack_with_items(W, val, wt, mode='critical', counter=counter, split=split)
+	result = {
+		'value': value,
+		'chosen': sorted(chosen),
+		'upper_bound': max(value, greed.fractional_bound(W, val, wt, counter, split=split)),
+		'phase': 'greedy',
+		'rounds': 0,
+	}
+	_gaps(result)
+	result['elapsed'] = time.monotonic() - start
+	if on_progress is not None:
+		on_progress(dict(result))
+
+	# Montar o núcleo percorre os n itens de novo, como a fase gulosa: só
+	# começa se o tempo restante cobre uma passada dessas
+	setup = result['elapsed']
+	if not result['optimal'] and (deadline is None or time.monotonic() + setup < deadline):
+		for best, upper, items in core.core_rounds(W, val, wt, counter, split=split):
+			result['rounds'] += 1
+			improved = False
+			if best > result['value']:
+				result.update(value=best, chosen=items(), phase='core')
+				improved = True
+			if upper < result['upper_bound']:
+				result['upper_bound'] = max(upper, result['value'])
+				improved = True
+			if improved:
+				_gaps(result)
+				result['elapsed'] = time.monotonic() - start
+				if on_progress is not None:
+					on_progress(dict(result))
+			if result['optimal'] or (deadline is not None and time.monotonic() >= deadline):
+				break
+
+	result['elapsed'] = time.monotonic() - start
+	return result
+
+
+def knapsack_with_items(W, val, wt, time_limit=None, counter=None):
+	"""Retorna (valor, indices_escolhidos) da melhor solução até o prazo."""
+	result = knapsack_anytime(W, val, wt, time_limit=time_limit, counter=counter)
+	return result['value'], result['chosen']
+
+
+def knapsack(W, val, wt, time_limit=None, counter=None):
+	"""Retorna apenas o valor (int) da melhor solução até o prazo."""
+	return knapsack_anytime(W, val, wt, time_limit=time_limit, counter=counter)['value']
+
+
+if __name__ == '__main__':
+	import random
+
+	# Exemplo de demonstração: instância fortemente correlacionada (difícil
+	# para o núcleo) com 20 ms de prazo; cada melhora é impressa
+	rng = random.Random(0)
+	wt = [rng.randint(1, 10000) for _ in range(2000)]
+	val = [w + 1000 for w in wt]
+	W = sum(wt) // 2
+
+	def show(r):
+		print(f"[{r['elapsed'] * 1000:7.2f} ms] {r['phase']:6s} valor={r['value']} "
+		      f"limite={r['upper_bound']} gap={r['rel_gap']:.2e}")
+
+	result = knapsack_anytime(W, val, wt, time_limit=0.02, on_progress=show)
+	print(f"Resultado: valor {result['value']}, ótimo provado: {result['optimal']}, "
+	      f"{result['rounds']} rodadas em {result['elapsed'] * 1000:.1f} ms")
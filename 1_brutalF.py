@@ -1,15 +1,23 @@
 # [Abordagem Ingênua] Usando Recursão O(2^n) Tempo e O(n) Espaço
 # Retorna o valor máximo que pode ser colocado em uma mochila de capacidade W
+#
+# Além da recursão ingênua, o módulo oferece dois modos exatos que evitam
+# a explosão combinatória sem alocar uma tabela de tamanho W:
+# - 'memo': mesma recursão, com cache limitado sobre os subproblemas (n, W)
+# - 'bb':   branch-and-bound com o limite fracionário (relaxação linear)
+#           calculado sobre os itens ordenados pela razão valor/peso
+#
+# Contagem de operações (chamadas recursivas / nós visitados): passe um
+# `counter` (knapsack_instrument.OpCounter). Sem ele, a recursão não paga
+# nenhum custo de contagem.
 
-# Variável global para contar operações (chamadas recursivas)
-OPS = 0
+import sys
+from functools import lru_cache
 
 def knapsackRec(W, val, wt, n):
-    global OPS
-    OPS += 1
-
-    # Caso Base: se não houver itens ou capacidade, o valor é 0
-    if n == 0 or W == 0:
+    # Caso Base: se não houver itens, o valor é 0 (com capacidade 0 ainda
+    # cabem itens de peso zero)
+    if n == 0:
         return 0
 
     pick = 0
@@ -24,16 +32,133 @@ def knapsackRec(W, val, wt, n):
     # Retorna o máximo entre escolher ou não o item
     return max(pick, notPick)
 
-def knapsack(W, val, wt):
-    global OPS
-    OPS = 0
+def _ensure_recursion_limit(depth):
+    # A profundidade da recursão é n; garante folga para n na casa das centenas
+    needed = depth + 100
+    if sys.getrecursionlimit() < needed:
+        sys.setrecursionlimit(needed)
+
+def _count_calls(W, wt, n):
+    """
+    Número de chamadas que `knapsackRec(W, val, wt, n)` faz, obtido pela mesma
+    recorrência com memoização (O(n x W) no pior caso, em vez de O(2^n)).
+    """
+    @lru_cache(maxsize=None)
+    def calls(n, W):
+        if n == 0:
+            return 1
+        total = 1 + calls(n - 1, W)
+        if wt[n - 1] <= W:
+            total += calls(n - 1, W - wt[n - 1])
+        return total
+
+    _ensure_recursion_limit(n)
+    return calls(n, W)
+
+def knapsackMemo(W, val, wt, n, max_cache=None, counter=None):
+    """
+    Mesma recorrência de `knapsackRec`, mas cada subproblema (n, W) é resolvido
+    uma única vez enquanto estiver no cache. `max_cache` limita o número de
+    entradas (política LRU); None deixa o cache ilimitado.
+    """
+    @lru_cache(maxsize=max_cache)
+    def rec(n, W):
+        if n == 0:
+            return 0
+
+        pick = 0
+        if wt[n - 1] <= W:
+            pick = val[n - 1] + rec(n - 1, W - wt[n - 1])
+        notPick = rec(n - 1, W)
+        return max(pick, notPick)
+
+    _ensure_recursion_limit(n)
+    best = rec(n, W)
+    if counter is not None:
+        # subproblemas efetivamente resolvidos (os acertos do cache não contam)
+        counter.add(rec.cache_info().misses)
+    return best
+
+def knapsackBB(W, val, wt, counter=None):
+    """
+    Branch-and-bound em profundidade. Os itens são ordenados pela razão
+    valor/peso (decrescente) e cada nó é podado quando o limite superior da
+    relaxação fracionária não supera a melhor solução já encontrada.
+    """
+    # Itens que não cabem nem na mochila vazia nunca participam da solução
+    items = [i for i in range(len(val)) if wt[i] <= W]
+    # Ordena por razão decrescente sem divisão (itens de peso zero vêm primeiro)
+    items.sort(key=lambda i: (wt[i] > 0, -val[i] / wt[i] if wt[i] > 0 else 0))
+    v = [val[i] for i in items]
+    w = [wt[i] for i in items]
+    n = len(items)
+
+    best = 0
+
+    def bound(k, cap, acc):
+        # Preenche gulosamente a partir do item k e completa com a fração do
+        # item crítico; o piso é um limite válido pois os valores são inteiros
+        for j in range(k, n):
+            if w[j] <= cap:
+                cap -= w[j]
+                acc += v[j]
+            else:
+                return acc + (cap * v[j]) // w[j]
+        return acc
+
+    def rec(k, cap, acc):
+        nonlocal best
+        if acc > best:
+            best = acc
+        if k == n or bound(k, cap, acc) <= best:
+            return
+
+        # Explora primeiro o ramo que escolhe o item (segue a ordem gulosa)
+        if w[k] <= cap:
+            rec(k + 1, cap - w[k], acc + v[k])
+        rec(k + 1, cap, acc)
+
+    if counter is not None:
+        # A recursão chama `rec` pela closure: trocar o nome por um invólucro
+        # conta os nós só quando a contagem foi pedida
+        explore = rec
+
+        def rec(k, cap, acc):
+            counter.add()
+            explore(k, cap, acc)
+
+    _ensure_recursion_limit(n)
+    rec(0, W, 0)
+    return best
+
+def knapsack(W, val, wt, mode='naive', max_cache=None, counter=None):
+    """
+    Resolve a mochila 0/1 de forma exata.
+
+    `mode` escolhe o motor: 'naive' (recursão original), 'memo' (recursão com
+    cache limitado a `max_cache` entradas) ou 'bb' (branch-and-bound).
+    `counter`, se dado, recebe o número de chamadas/nós visitados.
+    """
     n = len(val)
-    return knapsackRec(W, val, wt, n)
+    if mode == 'naive':
+        best = knapsackRec(W, val, wt, n)
+        if counter is not None:
+            counter.add(_count_calls(W, wt, n))
+        return best
+    if mode == 'memo':
+        return knapsackMemo(W, val, wt, n, max_cache=max_cache, counter=counter)
+    if mode == 'bb':
+        return knapsackBB(W, val, wt, counter=counter)
+    raise ValueError(f"modo desconhecido: {mode!r}")
 
 if __name__ == "__main__":
+    from knapsack_instrument import run
+
     val = [1, 2, 3]
     wt = [4, 5, 1]
     W = 4
 
-    print(knapsack(W, val, wt))
-    print(f"Operações: {OPS}")
\ No newline at end of file
+    for mode in ('naive', 'memo', 'bb'):
+        result = run(knapsack, W, val, wt, mode=mode)
+        print(f"{mode}: {result.value}")
+        print(f"Operações: {result.ops}")
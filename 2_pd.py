@@ -1,12 +1,129 @@
 # [Abordagem Esperada] Usando PD Bottom-Up (Espaço Otimizado) - O(n x W) Tempo e O(W) Espaço
 # Função para encontrar o lucro máximo
+#
+# Há dois backends para a mesma recorrência:
+# - 'python': laço célula a célula (versão original)
+# - 'numpy':  cada item atualiza todas as capacidades em uma única operação vetorial
+#
+# `knapsack_all_capacities` devolve o vetor dp inteiro (ótimo para toda
+# capacidade 0..W) e, opcionalmente, um bitmap de decisões para reconstrução.
+#
+# Contagem de operações (atualizações na tabela): passe um `counter`
+# (knapsack_instrument.OpCounter). O total é calculado de uma vez a partir dos
+# pesos, então os laços internos não carregam contador algum.
 
-# Variável global para contar operações (atualizações na tabela)
-OPS = 0
+def _cells(W, wt):
+    # Cada item de peso w <= W atualiza as capacidades w..W
+    return sum(W - w + 1 for w in wt if w <= W)
 
-def knapsack(W, val, wt):
-    global OPS
-    OPS = 0
+def _dp_numpy(W, val, wt, decisions=None):
+    # numpy só é necessário para este backend
+    import numpy as np
+
+    dp = np.zeros(W + 1, dtype=np.int64)
+    # Buffer auxiliar reaproveitado por todos os itens (sem realocação por item)
+    tmp = np.empty(W + 1, dtype=np.int64)
+    take = np.zeros(W + 1, dtype=bool) if decisions is not None else None
+
+    for i in range(len(wt)):
+        w = int(wt[i])
+        v = int(val[i])
+        if w > W:
+            if decisions is not None:
+                decisions.append(None)
+            continue
+        if w == 0:
+            dp += v
+            if decisions is not None:
+                take[:] = v > 0
+                decisions.append(np.packbits(take, bitorder='little'))
+            continue
+        # tmp recebe os valores da linha anterior antes da escrita in-place,
+        # o que preserva a semântica 0/1 (cada item usado no máximo uma vez)
+        k = W + 1 - w
+        np.add(dp[:k], v, out=tmp[:k])
+        if decisions is not None:
+            take[:w] = False
+            np.greater(tmp[:k], dp[w:], out=take[w:])
+            # mesmo layout de bits do backend Python (bit j&7 do byte j>>3)
+            decisions.append(np.packbits(take, bitorder='little'))
+        np.maximum(dp[w:], tmp[:k], out=dp[w:])
+
+    return dp
+
+def knapsack_numpy(W, val, wt, counter=None):
+    if counter is not None:
+        counter.add(_cells(W, wt))
+    return int(_dp_numpy(W, val, wt)[W])
+
+def _dp_python_decisions(W, val, wt, decisions):
+    # Mesma recorrência de `knapsack`, marcando num bitmap compacto (1 bit por
+    # capacidade) as capacidades em que o item i foi escolhido
+    dp = [0] * (W + 1)
+    for i in range(len(wt)):
+        wi = wt[i]
+        vi = val[i]
+        if wi > W:
+            decisions.append(None)
+            continue
+        bits = bytearray((W >> 3) + 1)
+        for j in range(W, wi - 1, -1):
+            cand = dp[j - wi] + vi
+            if cand > dp[j]:
+                dp[j] = cand
+                bits[j >> 3] |= 1 << (j & 7)
+        decisions.append(bits)
+    return dp
+
+def knapsack_all_capacities(Wmax, val, wt, keep_decisions=False, backend='python', counter=None):
+    """
+    Uma única passada da PD responde a todas as capacidades 0..Wmax: retorna
+    a lista `best` com best[c] = valor ótimo para capacidade c.
+
+    Com keep_decisions=True retorna (best, decisions), onde decisions guarda um
+    bitmap de escolhas por item (n x (Wmax+1) bits no total); `backtrack` usa
+    essa estrutura para recuperar os itens de qualquer capacidade consultada
+    sem refazer a PD.
+    """
+    if counter is not None:
+        counter.add(_cells(Wmax, wt))
+
+    decisions = [] if keep_decisions else None
+    if backend == 'numpy':
+        best = _dp_numpy(Wmax, val, wt, decisions).tolist()
+    elif backend != 'python':
+        raise ValueError(f"backend desconhecido: {backend!r}")
+    elif keep_decisions:
+        best = _dp_python_decisions(Wmax, val, wt, decisions)
+    else:
+        best = [0] * (Wmax + 1)
+        for i in range(len(wt)):
+            for j in range(Wmax, wt[i] - 1, -1):
+                best[j] = max(best[j], best[j - wt[i]] + val[i])
+
+    if keep_decisions:
+        return best, decisions
+    return best
+
+def backtrack(decisions, wt, capacity):
+    """Índices (base 0, ordem crescente) de uma solução ótima para `capacity`."""
+    chosen = []
+    c = capacity
+    for i in range(len(decisions) - 1, -1, -1):
+        bits = decisions[i]
+        if bits is not None and bits[c >> 3] >> (c & 7) & 1:
+            chosen.append(i)
+            c -= wt[i]
+    chosen.reverse()
+    return chosen
+
+def knapsack(W, val, wt, backend='python', counter=None):
+    if backend == 'numpy':
+        return knapsack_numpy(W, val, wt, counter=counter)
+    if backend != 'python':
+        raise ValueError(f"backend desconhecido: {backend!r}")
+    if counter is not None:
+        counter.add(_cells(W, wt))
     
     # Inicializando a lista dp com 0
     # dp[j] armazenará o valor máximo para a capacidade j
@@ -19,15 +136,17 @@ def knapsack(W, val, wt):
         # Isso garante que estamos usando os dados da computação anterior (i-1 itens)
         # sem reutilizar o mesmo item na mesma iteração
         for j in range(W, wt[i - 1] - 1, -1):
-            OPS += 1
             dp[j] = max(dp[j], dp[j - wt[i - 1]] + val[i - 1])
     
     return dp[W]
 
 if __name__ == "__main__":
+    from knapsack_instrument import run
+
     val = [1, 2, 3]
     wt = [4, 5, 1]
     W = 4
 
-    print(knapsack(W, val, wt))
-    print(f"Operações: {OPS}")
\ No newline at end of file
+    result = run(knapsack, W, val, wt)
+    print(result.value)
+    print(f"Operações: {result.ops}")
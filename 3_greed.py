@@ -1,23 +1,25 @@
 # [Aproximação] Abordagem Gulosa (razão valor/peso) - Tempo O(n log n)
+#
+# O modo 'critical' evita a ordenação: encontra o item crítico (o primeiro que
+# não cabe na ordem gulosa) por particionamento em torno da mediana das razões,
+# em tempo O(n) esperado, e retorna max(guloso, melhor item isolado), que é uma
+# 1/2-aproximação.
+#
+# Contagem de operações (comparações/acessos principais): passe um `counter`
+# (knapsack_instrument.OpCounter); as contagens são somadas em bloco.
 
-# Variável global para contar operações (comparações/acessos principais)
-OPS = 0
+import math
+import random
 
-def knapsack(W, val, wt):
-    """
-    Aproximação gulosa para o problema da mochila 0/1: ordena os itens pela razão valor/peso
-    e seleciona enquanto a capacidade permitir. Isso não é ótimo no caso geral,
-    mas é rápido e útil para instâncias grandes.
+# Gerador próprio para as amostras de pivô de critical_split: não consome o
+# estado global de `random` de quem chama
+_RNG = random.Random()
 
-    Retorna o valor total dos itens escolhidos.
-    """
-    global OPS
-    OPS = 0
-    
+def _ratio_order(val, wt, counter=None):
+    """Itens (razão, peso, valor, índice) ordenados por razão decrescente."""
     n = len(val)
     items = []
     for i in range(n):
-        OPS += 1 # cálculo de razão
         if wt[i] <= 0:
             # evita divisão por zero; trata itens de peso zero como razão muito alta
             ratio = float('inf')
@@ -26,18 +28,91 @@ def knapsack(W, val, wt):
         items.append((ratio, wt[i], val[i], i))
 
     # Ordena por razão decrescente
-    # A complexidade de sort é O(n log n), vamos contar n log n como operações aproximadas
-    import math
-    if n > 0:
-        OPS += int(n * math.log2(n))
-    
+    # Conta n cálculos de razão; a complexidade de sort é O(n log n), então
+    # contamos n log n como operações aproximadas
+    if counter is not None and n > 0:
+        counter.add(n + int(n * math.log2(n)))
+
     items.sort(key=lambda x: x[0], reverse=True)
+    return items
+
+def critical_split(W, val, wt, counter=None):
+    """
+    Solução gulosa até o item crítico sem ordenar os itens.
+
+    Trabalha sobre listas paralelas (índices e razões) e, a cada rodada,
+    particiona os candidatos em torno da mediana de uma amostra de razões:
+    se os itens de razão maior cabem, são todos levados e a busca continua
+    nos de razão menor; senão, a busca continua só entre os de razão maior.
+    Itens mais pesados que W são descartados antes.
+
+    Retorna (escolhidos, capacidade_restante, item_critico); item_critico é
+    None quando todos os itens cabem.
+    """
+    idx = [i for i in range(len(val)) if wt[i] <= W]
+    ratio = [0.0] * len(val)
+    for i in idx:
+        # evita divisão por zero; trata itens de peso zero como razão muito alta
+        ratio[i] = val[i] / wt[i] if wt[i] > 0 else float('inf')
+    if counter is not None:
+        counter.add(len(val))
+
+    remaining = W
+    chosen = []
+    while idx:
+        # uma passada linear por rodada
+        if counter is not None:
+            counter.add(len(idx))
+        sample = sorted(ratio[i] for i in _RNG.sample(idx, min(5, len(idx))))
+        pivot = sample[len(sample) // 2]
+
+        greater = [i for i in idx if ratio[i] > pivot]
+        greater_w = sum(wt[i] for i in greater)
+        if greater_w > remaining:
+            idx = greater
+            continue
+
+        chosen += greater
+        remaining -= greater_w
+        # Itens com razão igual ao pivô: ordem arbitrária entre eles
+        for i in idx:
+            if ratio[i] == pivot:
+                if wt[i] > remaining:
+                    return chosen, remaining, i
+                chosen.append(i)
+                remaining -= wt[i]
+        idx = [i for i in idx if ratio[i] < pivot]
+
+    return chosen, remaining, None
+
+def knapsack_with_items(W, val, wt, mode='sort', counter=None, split=None):
+    """
+    Mesma aproximação gulosa de `knapsack`, retornando (valor_total, indices_escolhidos)
+    com os índices na ordem em que foram escolhidos.
+
+    Com mode='critical' os itens não são ordenados: a solução é o maior valor
+    entre o prefixo guloso até o item crítico e o melhor item isolado que cabe,
+    o que garante pelo menos metade do ótimo. `split` é o resultado de
+    `critical_split(W, val, wt)` quando o chamador já o calculou.
+    """
+    if mode == 'critical':
+        chosen, _, _ = split if split is not None else critical_split(W, val, wt, counter)
+        chosen = list(chosen)
+        total_value = sum(val[i] for i in chosen)
+        best_single = max((i for i in range(len(val)) if wt[i] <= W), key=lambda i: val[i], default=None)
+        if counter is not None:
+            counter.add(len(val))
+        if best_single is not None and val[best_single] > total_value:
+            return val[best_single], [best_single]
+        return total_value, chosen
+    if mode != 'sort':
+        raise ValueError(f"modo desconhecido: {mode!r}")
 
     remaining = W
     total_value = 0
     chosen = []
-    for ratio, w, v, idx in items:
-        OPS += 1 # visita do item
+    visited = 0
+    for visited, (ratio, w, v, idx) in enumerate(_ratio_order(val, wt, counter), 1):
         if w <= remaining:
             chosen.append(idx)
             remaining -= w
@@ -46,12 +121,45 @@ def knapsack(W, val, wt):
         if remaining == 0:
             break
 
+    if counter is not None:
+        counter.add(visited) # visitas aos itens
+    return total_value, chosen
+
+def fractional_bound(W, val, wt, counter=None, split=None):
+    """
+    Limite superior de Dantzig (relaxação linear): preenche a mochila pela razão
+    valor/peso e completa com a fração do primeiro item que não cabe. Nenhuma
+    solução 0/1 tem valor maior que este. `split` é o resultado de
+    `critical_split(W, val, wt)` quando o chamador já o calculou.
+    """
+    # O limite só depende do item crítico, que é achado em tempo linear
+    chosen, remaining, critical = split if split is not None else critical_split(W, val, wt, counter)
+    bound = sum(val[i] for i in chosen)
+    if critical is not None:
+        # piso da fração: os valores são inteiros, então o limite continua válido
+        bound += val[critical] * remaining // wt[critical]
+
+    return bound
+
+def knapsack(W, val, wt, mode='sort', counter=None):
+    """
+    Aproximação gulosa para o problema da mochila 0/1: ordena os itens pela razão valor/peso
+    e seleciona enquanto a capacidade permitir. Isso não é ótimo no caso geral,
+    mas é rápido e útil para instâncias grandes.
+
+    Retorna o valor total dos itens escolhidos.
+    """
+    total_value, _ = knapsack_with_items(W, val, wt, mode=mode, counter=counter)
     return total_value
 
 if __name__ == "__main__":
+    from knapsack_instrument import run
+
     val = [1, 2, 3]
     wt = [4, 5, 1]
     W = 4
     
-    print(knapsack(W, val, wt))
-    print(f"Operações: {OPS}")
\ No newline at end of file
+    for mode in ('sort', 'critical'):
+        result = run(knapsack, W, val, wt, mode=mode)
+        print(f"{mode}: {result.value}")
+        print(f"Operações: {result.ops}")
\ No newline at end of file
@@ -5,14 +5,57 @@ Fornece duas funções:
 - `knapsack(W, val, wt)` -> retorna o valor total máximo (int) (mantém compatibilidade)
 - `knapsack_with_items(W, val, wt)` -> retorna (valor_total, indices_escolhidos)
 
+A reconstrução tem dois modos (parâmetro `mode`):
+- 'table': tabela completa (n+1) x (W+1) seguida de backtracking (original)
+- 'hirschberg': divisão e conquista sobre os itens combinando linhas 1-D
+  da PD para frente e para trás; usa memória O(n + W) e tempo O(n x W)
+
 Quando executado como script, demonstra o algoritmo e imprime quais itens foram
 escolhidos (por índice) e o valor total.
+
+Contagem de operações (células preenchidas): passe um `counter`
+(knapsack_instrument.OpCounter); o total é somado uma vez por linha da PD.
 """
 
-# Variável global para contar operações (células preenchidas)
-OPS = 0
+def _dp_row(W, val, wt, lo, hi, counter=None):
+	"""Linha 1-D da PD (capacidades 0..W) usando apenas os itens lo..hi-1."""
+	if counter is not None:
+		counter.add(sum(W - wt[i] + 1 for i in range(lo, hi) if wt[i] <= W))
+	dp = [0] * (W + 1)
+	for i in range(lo, hi):
+		vi = val[i]
+		wi = wt[i]
+		for w in range(W, wi - 1, -1):
+			if dp[w - wi] + vi > dp[w]:
+				dp[w] = dp[w - wi] + vi
+	return dp
+
 
-def knapsack_with_items(W, val, wt):
+def _hirschberg(W, val, wt, lo, hi, chosen, counter=None):
+	"""
+	Adiciona a `chosen` (em ordem crescente) os itens de lo..hi-1 de uma
+	solução ótima com capacidade W. A capacidade é dividida entre as duas
+	metades no ponto c que maximiza f[c] + g[W - c], onde f e g são as linhas
+	finais da PD de cada metade; as linhas são descartadas antes da recursão.
+	"""
+	if hi - lo == 1:
+		if counter is not None:
+			counter.add()
+		if wt[lo] <= W and val[lo] > 0:
+			chosen.append(lo)
+		return
+
+	mid = (lo + hi) // 2
+	f = _dp_row(W, val, wt, lo, mid, counter)
+	g = _dp_row(W, val, wt, mid, hi, counter)
+	split = max(range(W + 1), key=lambda c: f[c] + g[W - c])
+	del f, g
+
+	_hirschberg(split, val, wt, lo, mid, chosen, counter)
+	_hirschberg(W - split, val, wt, mid, hi, chosen, counter)
+
+
+def knapsack_with_items(W, val, wt, mode='table', counter=None):
 	"""
 	PD Bottom-up para mochila 0/1 que também reconstrói os itens escolhidos.
 
@@ -20,9 +63,17 @@ def knapsack_with_items(W, val, wt):
 	de índices de itens (base 0) que foram selecionados para alcançar o max_value. 
     A reconstrução prefere itens de índice mais alto primeiro quando ocorrem empates 
     devido à ordem de backtracking.
+
+	Com mode='hirschberg' a tabela completa não é construída; os itens são
+	recuperados por divisão e conquista em memória O(n + W).
 	"""
-	global OPS
-	OPS = 0
+	if mode == 'hirschberg':
+		chosen = []
+		if val:
+			_hirschberg(W, val, wt, 0, len(val), chosen, counter)
+		return sum(val[i] for i in chosen), chosen
+	if mode != 'table':
+		raise ValueError(f"modo desconhecido: {mode!r}")
 	
 	n = len(val)
 	# dp[i][w] = valor máximo usando os primeiros i itens (itens 0..i-1) com capacidade w
@@ -32,7 +83,6 @@ def knapsack_with_items(W, val, wt):
 		vi = val[i - 1]
 		wi = wt[i - 1]
 		for w in range(0, W + 1):
-			OPS += 1
 			if wi <= w:
 				# escolher ou não escolher
 				pick = vi + dp[i - 1][w - wi]
@@ -45,8 +95,8 @@ def knapsack_with_items(W, val, wt):
 	# Reconstruir itens escolhidos (Backtracking na tabela DP)
 	chosen = []
 	w = W
+	i = n + 1
 	for i in range(n, 0, -1):
-		OPS += 1 # operação de backtracking
 		if dp[i][w] != dp[i - 1][w]:
 			# o item i-1 foi pego
 			chosen.append(i - 1)
@@ -54,23 +104,28 @@ def knapsack_with_items(W, val, wt):
 			if w <= 0:
 				break
 
+	if counter is not None:
+		# n x (W+1) células preenchidas + operações de backtracking (n..i)
+		counter.add(n * (W + 1) + n - i + 1)
 	chosen.reverse()
 	return dp[n][W], chosen
 
 
-def knapsack(W, val, wt):
+def knapsack(W, val, wt, counter=None):
 	"""Wrapper de compatibilidade que retorna apenas o valor máximo (int)."""
-	max_val, _ = knapsack_with_items(W, val, wt)
+	max_val, _ = knapsack_with_items(W, val, wt, counter=counter)
 	return max_val
 
 
 if __name__ == '__main__':
+	from knapsack_instrument import run
+
 	# Exemplo de demonstração
 	val = [1, 2, 3]
 	wt = [4, 5, 1]
 	W = 4
 
-	total, items = knapsack_with_items(W, val, wt)
-	print(f"Valor máximo: {total}")
-	print(f"Índices dos itens escolhidos: {items}")
-	print(f"Operações: {OPS}")
\ No newline at end of file
+	result = run(knapsack_with_items, W, val, wt)
+	print(f"Valor máximo: {result.value}")
+	print(f"Índices dos itens escolhidos: {result.chosen}")
+	print(f"Operações: {result.ops}")
\ No newline at end of file
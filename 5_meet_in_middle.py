@@ -0,0 +1,96 @@
+"""
+Meet-in-the-middle (Horowitz–Sahni) para o problema da mochila 0/1.
+
+O custo não depende da capacidade W, apenas de n: cada metade dos itens gera
+no máximo 2^(n/2) somas parciais. Isso permite resolver instâncias com W
+enorme (ex.: 10^12), onde as tabelas de 2_pd.py e 4_pd_com_itens.py não
+cabem na memória.
+
+Fornece duas funções (mesma API de 4_pd_com_itens.py):
+- `knapsack(W, val, wt)` -> retorna o valor total máximo (int)
+- `knapsack_with_items(W, val, wt)` -> retorna (valor_total, indices_escolhidos)
+
+Contagem de operações (estados gerados + passos do merge): passe um `counter`
+(knapsack_instrument.OpCounter); o total é somado uma vez por item.
+"""
+from bisect import bisect_right
+
+from knapsack_pareto import merge, items
+
+
+def _frontier(W, val, wt, indices, counter=None):
+	"""
+	Enumera as somas parciais dos itens em `indices` mantendo apenas a
+	fronteira não dominada (knapsack_pareto.merge): listas paralelas
+	(pesos, valores, decisões) ordenadas por peso crescente com valores
+	estritamente crescentes. Somas com peso acima de W são descartadas.
+	"""
+	ws, vs, ds = [0], [0], [None]
+
+	for idx in indices:
+		wi = wt[idx]
+		if wi > W:
+			continue
+		if counter is not None:
+			# estados visitados: toda a fronteira e a parte da cópia que cabe
+			counter.add(len(ws) + bisect_right(ws, W - wi))
+		ws, vs, ds = merge(ws, vs, ds, wi, val[idx], idx, W)
+
+	return ws, vs, ds
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""
+	Divide os itens em duas metades, gera a fronteira de cada uma e combina
+	com dois ponteiros: para cada estado da primeira metade (peso crescente)
+	o melhor parceiro é o estado mais pesado da segunda que ainda cabe.
+
+	Retorna uma tupla (max_value, chosen_indices) com índices em ordem crescente.
+	"""
+	n = len(val)
+	left = list(range(n // 2))
+	right = list(range(n // 2, n))
+
+	lw, lv, ld = _frontier(W, val, wt, left, counter)
+	rw, rv, rd = _frontier(W, val, wt, right, counter)
+
+	best = -1
+	best_pair = (0, 0)
+	j = len(rw) - 1
+	for i in range(len(lw)):
+		# Como lw cresce, o ponteiro j só anda para trás
+		while j >= 0 and lw[i] + rw[j] > W:
+			j -= 1
+		if j < 0:
+			break
+		total = lv[i] + rv[j]
+		if total > best:
+			best = total
+			best_pair = (i, j)
+	if counter is not None:
+		# passos do merge: i + 1 estados da esquerda e os recuos de j
+		counter.add(i + 1 + len(rw) - 1 - j)
+
+	i, j = best_pair
+	# As decisões guardam os índices na ordem em que os itens foram aplicados
+	return max(best, 0), items(ld[i]) + items(rd[j])
+
+
+def knapsack(W, val, wt, counter=None):
+	"""Wrapper de compatibilidade que retorna apenas o valor máximo (int)."""
+	max_val, _ = knapsack_with_items(W, val, wt, counter=counter)
+	return max_val
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import run
+
+	# Exemplo de demonstração
+	val = [1, 2, 3]
+	wt = [4, 5, 1]
+	W = 4
+
+	result = run(knapsack_with_items, W, val, wt)
+	print(f"Valor máximo: {result.value}")
+	print(f"Índices dos itens escolhidos: {result.chosen}")
+	print(f"Operações: {result.ops}")
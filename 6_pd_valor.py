@@ -0,0 +1,118 @@
+"""
+Programação Dinâmica indexada por valor para o problema da mochila 0/1.
+
+Em vez de indexar a tabela pela capacidade, `minw[p]` guarda o menor peso
+necessário para atingir valor exatamente p. O custo é O(n x ΣV) tempo, e
+não depende de W, o que favorece instâncias com valores pequenos e pesos e
+capacidade enormes.
+
+Fornece duas funções (mesma API de 4_pd_com_itens.py):
+- `knapsack(W, val, wt)` -> retorna o valor total máximo (int)
+- `knapsack_with_items(W, val, wt)` -> retorna (valor_total, indices_escolhidos)
+
+Contagem de operações (células atualizadas): passe um `counter`
+(knapsack_instrument.OpCounter); o total é somado uma vez por item.
+"""
+
+
+def min_weight_table(W, val, wt, max_value=None, keep_decisions=True, counter=None):
+	"""
+	Preenche `minw[p]` = menor peso para atingir valor exatamente p (W + 1
+	quando inalcançável) e retorna (minw, decisions).
+
+	`max_value` limita a largura da tabela quando o chamador sabe que nenhuma
+	solução viável ultrapassa esse valor. `decisions` é uma lista de
+	(índice, bytearray) com as escolhas de cada item, usada por `backtrack`;
+	fica vazia quando keep_decisions=False (memória O(ΣV)).
+	"""
+	# Qualquer peso acima de W é inviável; W + 1 faz o papel de infinito
+	INF = W + 1
+	minw = [0]
+	total = 0
+	decisions = []
+
+	for i in range(len(val)):
+		vi = val[i]
+		wi = wt[i]
+		# Itens que não cabem ou sem valor nunca melhoram a solução
+		if wi > W or vi <= 0:
+			continue
+
+		grow = vi if max_value is None else min(vi, max_value - total)
+		if grow > 0:
+			minw.extend([INF] * grow)
+		total += grow
+		if counter is not None and total >= vi:
+			counter.add(total - vi + 1)
+		take = bytearray(total + 1) if keep_decisions else None
+		for p in range(total, vi - 1, -1):
+			c = minw[p - vi] + wi
+			if c < minw[p]:
+				minw[p] = c
+				if keep_decisions:
+					take[p] = 1
+		if keep_decisions:
+			decisions.append((i, take))
+
+	return minw, decisions
+
+
+def backtrack(decisions, val, p, counter=None):
+	"""Recupera, em ordem crescente, os itens que atingem valor p em `minw`."""
+	chosen = []
+	steps = 0
+	for i, take in reversed(decisions):
+		if p == 0:
+			break
+		steps += 1
+		if p < len(take) and take[p]:
+			chosen.append(i)
+			p -= val[i]
+	if counter is not None:
+		counter.add(steps)
+	chosen.reverse()
+	return chosen
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""
+	PD sobre valores com reconstrução dos itens escolhidos.
+
+	Para cada item guarda-se um vetor de decisões (1 byte por valor alcançável
+	até aquele item), usado no backtracking. Retorna uma tupla
+	(max_value, chosen_indices) com índices em ordem crescente.
+	"""
+	minw, decisions = min_weight_table(W, val, wt, counter=counter)
+
+	# Maior valor cujo peso mínimo cabe na mochila
+	best = len(minw) - 1
+	while minw[best] > W:
+		best -= 1
+
+	return best, backtrack(decisions, val, best, counter)
+
+
+def knapsack(W, val, wt, counter=None):
+	"""
+	Versão que retorna apenas o valor máximo (int), sem guardar as decisões;
+	usa memória O(ΣV).
+	"""
+	minw, _ = min_weight_table(W, val, wt, keep_decisions=False, counter=counter)
+	best = len(minw) - 1
+	while minw[best] > W:
+		best -= 1
+	return best
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import run
+
+	# Exemplo de demonstração
+	val = [1, 2, 3]
+	wt = [4, 5, 1]
+	W = 4
+
+	result = run(knapsack_with_items, W, val, wt)
+	print(f"Valor máximo: {result.value}")
+	print(f"Índices dos itens escolhidos: {result.chosen}")
+	print(f"Operações: {result.ops}")
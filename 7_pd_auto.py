@@ -0,0 +1,50 @@
+"""
+Despachante automático entre as duas Programações Dinâmicas exatas.
+
+- PD indexada por capacidade (2_pd.py / 4_pd_com_itens.py): O(n x W)
+- PD indexada por valor (6_pd_valor.py): O(n x ΣV)
+
+A escolha compara W com ΣV (somando apenas itens que cabem na mochila) e
+roda a tabela mais estreita. A escolha depende só da instância: `choose`
+diz qual PD ('capacity' ou 'value') uma chamada com os mesmos argumentos
+usa, sem estado global, então chamadas concorrentes não interferem (o
+benchmark registra a escolha assim). O `counter` opcional é repassado à
+PD escolhida.
+
+Fornece `knapsack(W, val, wt)` e `knapsack_with_items(W, val, wt)`.
+"""
+import knapsack_registry
+
+
+def choose(W, val, wt):
+	"""Retorna 'capacity' ou 'value' conforme a largura de cada tabela."""
+	total_value = sum(v for v, w in zip(val, wt) if w <= W and v > 0)
+	return 'value' if total_value < W else 'capacity'
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""Retorna (max_value, chosen_indices) usando a PD mais barata."""
+	if choose(W, val, wt) == 'value':
+		return knapsack_registry.load('value_dp').knapsack_with_items(W, val, wt, counter=counter)
+	return knapsack_registry.load('table_dp').knapsack_with_items(W, val, wt, mode='hirschberg', counter=counter)
+
+
+def knapsack(W, val, wt, counter=None):
+	"""Retorna apenas o valor máximo (int) usando a PD mais barata."""
+	mod = knapsack_registry.load('value_dp' if choose(W, val, wt) == 'value' else 'dp')
+	return mod.knapsack(W, val, wt, counter=counter)
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import run
+
+	# Exemplo de demonstração
+	val = [1, 2, 3]
+	wt = [4, 5, 1]
+	W = 4
+
+	result = run(knapsack_with_items, W, val, wt)
+	print(f"Valor máximo: {result.value}")
+	print(f"Índices dos itens escolhidos: {result.chosen}")
+	print(f"PD utilizada: {choose(W, val, wt)}")
+	print(f"Operações: {result.ops}")
@@ -0,0 +1,159 @@
+"""
+Esquema de aproximação totalmente polinomial (FPTAS) para a mochila 0/1.
+
+Dado `eps` em (0, 1), retorna uma seleção com valor >= (1 - eps) * ótimo em
+tempo polinomial em n e 1/eps, combinando os módulos existentes:
+- 3_greed.py fornece o limite inferior LB = max(guloso, melhor item isolado),
+  com LB >= ótimo / 2, e o limite superior fracionário (relaxação linear);
+- 6_pd_valor.py resolve a PD indexada por valor sobre os lucros escalados.
+
+Seguindo Ibarra–Kim/Lawler, só os itens "grandes" (valor > eps * LB / 2)
+entram na PD, com lucros divididos por K = eps^2 * LB / 4; a tabela fica com
+largura O(1/eps^2), independente de n e W. Os itens "pequenos" completam
+cada estado da PD gulosamente pela razão valor/peso.
+
+Fornece:
+- `knapsack(W, val, wt, eps)` -> valor (int)
+- `knapsack_with_items(W, val, wt, eps)` -> (valor, indices_escolhidos)
+- `knapsack_fptas(W, val, wt, eps)` -> dicionário com a solução e os limites
+
+Todas aceitam um `counter` (knapsack_instrument.OpCounter) opcional, repassado
+ao guloso e à PD, que contam em bloco.
+"""
+import heapq
+from bisect import bisect_right
+
+import knapsack_registry
+
+
+def _greedy_fill(W, val, wt, order, chosen):
+	"""Completa `chosen` percorrendo `order` e pegando todo item que couber."""
+	remaining = W - sum(wt[i] for i in chosen)
+	for i in order:
+		if wt[i] <= remaining:
+			chosen.append(i)
+			remaining -= wt[i]
+	return chosen
+
+
+def knapsack_fptas(W, val, wt, eps=0.1, counter=None):
+	"""
+	Retorna um dicionário com:
+	- 'value', 'chosen': solução (1 - eps)-aproximada (índices em ordem crescente)
+	- 'greedy_value': valor de max(guloso, melhor item isolado)
+	- 'fptas_bound': limite superior garantido pelo esquema, value / (1 - eps)
+	- 'greedy_bound': limite superior da relaxação fracionária (guloso)
+	- 'upper_bound': o menor dos dois limites
+	"""
+	if not 0 < eps < 1:
+		raise ValueError(f"eps deve estar em (0, 1), recebido {eps!r}")
+
+	greed = knapsack_registry.load('greedy')
+	pd_valor = knapsack_registry.load('value_dp')
+
+	# max(prefixo guloso até o item crítico, melhor item isolado): só essa
+	# combinação garante LB >= ótimo / 2, que limita a tabela abaixo
+	g_value, g_chosen = greed.knapsack_with_items(W, val, wt, mode='critical', counter=counter)
+	greedy_bound = greed.fractional_bound(W, val, wt, counter)
+
+	fit = [i for i in range(len(val)) if wt[i] <= W and val[i] > 0]
+	incumbent = (g_value, list(g_chosen))
+	lower = incumbent[0]
+
+	if lower > 0:
+		# Limiar entre itens grandes e pequenos e fator de escala dos lucros
+		t = eps * lower / 2
+		K = eps * t / 2
+		# Nenhuma solução viável passa de min(LP, 2 * LB); em lucros escalados
+		# isso limita a largura da tabela da PD
+		max_scaled = int(min(greedy_bound, 2 * lower) / K)
+
+		# Lawler: com lucro escalado p cabem no máximo max_scaled // p itens
+		# numa solução viável, então basta manter os mais leves de cada grupo
+		groups = {}
+		small = []
+		for i in fit:
+			if val[i] > t:
+				groups.setdefault(int(val[i] / K), []).append(i)
+			else:
+				small.append(i)
+		large = []
+		if counter is not None:
+			counter.add(len(fit) - len(small))
+		for p, members in groups.items():
+			large += heapq.nsmallest(max_scaled // p, members, key=lambda i: wt[i])
+
+		# Pequenos em ordem de razão decrescente (peso zero primeiro), com
+		# somas prefixadas para completar qualquer estado em O(log n)
+		small.sort(key=lambda i: (wt[i] > 0, -val[i] / wt[i] if wt[i] > 0 else 0))
+		prefix_w = [0]
+		prefix_v = [0]
+		for i in small:
+			prefix_w.append(prefix_w[-1] + wt[i])
+			prefix_v.append(prefix_v[-1] + val[i])
+
+		scaled = [int(val[i] / K) for i in large]
+		weights = [wt[i] for i in large]
+		minw, decisions = pd_valor.min_weight_table(W, scaled, weights, max_value=max_scaled, counter=counter)
+
+		# Estimativa de cada estado: K * p (piso do valor real dos grandes)
+		# mais o maior prefixo de pequenos que cabe na capacidade restante
+		best_p = 0
+		best_estimate = -1
+		for p in range(len(minw)):
+			if minw[p] > W:
+				continue
+			k = bisect_right(prefix_w, W - minw[p]) - 1
+			estimate = K * p + prefix_v[k]
+			if estimate > best_estimate:
+				best_estimate = estimate
+				best_p = p
+
+		chosen = [large[j] for j in pd_valor.backtrack(decisions, scaled, best_p, counter)]
+		if counter is not None:
+			# estados viáveis avaliados + itens pequenos percorridos
+			counter.add(sum(1 for w in minw if w <= W) + len(small))
+		_greedy_fill(W, val, wt, small, chosen)
+		value = sum(val[i] for i in chosen)
+		if value > incumbent[0]:
+			incumbent = (value, chosen)
+
+	value, chosen = incumbent
+	fptas_bound = value / (1 - eps)
+	return {
+		'value': value,
+		'chosen': sorted(chosen),
+		'eps': eps,
+		'greedy_value': lower,
+		'fptas_bound': fptas_bound,
+		'greedy_bound': greedy_bound,
+		'upper_bound': min(fptas_bound, greedy_bound),
+	}
+
+
+def knapsack_with_items(W, val, wt, eps=0.1, counter=None):
+	"""Retorna (valor, indices_escolhidos) da solução (1 - eps)-aproximada."""
+	result = knapsack_fptas(W, val, wt, eps, counter)
+	return result['value'], result['chosen']
+
+
+def knapsack(W, val, wt, eps=0.1, counter=None):
+	"""Retorna apenas o valor (int) da solução (1 - eps)-aproximada."""
+	return knapsack_fptas(W, val, wt, eps, counter)['value']
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import OpCounter
+
+	# Exemplo de demonstração
+	val = [1, 2, 3]
+	wt = [4, 5, 1]
+	W = 4
+
+	counter = OpCounter()
+	result = knapsack_fptas(W, val, wt, eps=0.1, counter=counter)
+	print(f"Valor: {result['value']}")
+	print(f"Índices dos itens escolhidos: {result['chosen']}")
+	print(f"Limite superior (FPTAS): {result['fptas_bound']:.2f}")
+	print(f"Limite superior (guloso): {result['greedy_bound']}")
+	print(f"Operações: {counter.ops}")
@@ -0,0 +1,143 @@
+"""
+Solver exato baseado em núcleo ("expanding core", no estilo de Pisinger).
+
+Em instâncias aleatórias grandes, a solução ótima difere da solução gulosa
+apenas em itens com razão valor/peso próxima à do item crítico (o primeiro
+que não cabe na ordem gulosa). O algoritmo:
+
+1. encontra a solução gulosa até o item crítico em tempo linear
+   (3_greed.critical_split), sem ordenar os itens;
+2. parte dessa solução e expande um núcleo ao redor do item crítico, um item
+   por vez, alternando entre os itens levados (que podem ser removidos) e os
+   não levados (que podem ser adicionados), sempre o mais próximo do crítico;
+3. mantém uma PD esparsa de estados (peso, valor) não dominados
+   (knapsack_pareto.merge) e descarta
+   cada estado cujo limite superior não supera a melhor solução conhecida;
+4. para quando não sobra estado: os itens fora do núcleo ficam fixados como
+   na solução gulosa e a otimalidade está provada pelos limites.
+
+Fornece `knapsack(W, val, wt)` e `knapsack_with_items(W, val, wt)`, além de
+`core_rounds`, que expõe a busca rodada a rodada (melhor solução e limite
+superior provado), usada pelo solver com prazo de 15_anytime.py. A
+contagem de operações (estados gerados + itens do núcleo) é feita em bloco
+num `counter` (knapsack_instrument.OpCounter) opcional.
+"""
+import heapq
+
+import knapsack_registry
+from knapsack_pareto import merge, items
+
+
+def core_rounds(W, val, wt, counter=None, split=None):
+	"""
+	Executa o núcleo expansível uma rodada por vez. Depois da poda de cada
+	rodada produz (melhor, limite_superior, itens): o valor da melhor solução
+	encontrada, um limite superior válido para o ótimo (o maior limite entre
+	os estados que sobreviveram à poda, ou o próprio melhor) e uma função
+	`itens()` que reconstrói os índices dessa solução. A última rodada tem
+	limite_superior == melhor, o que prova a otimalidade. `split` é o
+	resultado de 3_greed.critical_split(W, val, wt) quando o chamador já o
+	calculou.
+	"""
+	if split is None:
+		split = knapsack_registry.load('greedy').critical_split(W, val, wt, counter)
+	above, remaining, _ = split
+
+	taken = set(above)
+	below = [i for i in range(len(val)) if wt[i] <= W and i not in taken]
+
+	# Itens mais próximos do crítico saem primeiro de cada heap: entre os
+	# levados, o de menor razão; entre os não levados, o de maior razão.
+	# (razão, índice); itens levados de peso zero nunca entram no núcleo.
+	above_heap = [(val[i] / wt[i], i) for i in above if wt[i] > 0]
+	below_heap = [(-val[i] / wt[i], i) for i in below]
+	heapq.heapify(above_heap)
+	heapq.heapify(below_heap)
+
+	# Estados relativos à solução gulosa: d é a lista encadeada dos itens
+	# cujo status foi invertido em relação a ela
+	ws = [W - remaining]
+	vs = [sum(val[i] for i in above)]
+	ds = [None]
+	best = vs[0]
+	best_d = None
+
+	def solution(d):
+		# Reconstrução: inverte, na solução gulosa, os itens alterados
+		return sorted(taken.symmetric_difference(items(d)))
+
+	side = 0
+	while True:
+		# Limite de cada estado usando a razão do próximo item fora do núcleo
+		# de cada lado; como os valores são inteiros, o piso é válido
+		next_below = below_heap[0][1] if below_heap else None
+		next_above = above_heap[0][1] if above_heap else None
+		if counter is not None:
+			counter.add(len(ws))
+		kws, kvs, kds = [], [], []
+		upper = None
+		for w, v, d in zip(ws, vs, ds):
+			if w <= W:
+				if v > best:
+					best = v
+					best_d = d
+				if next_below is None:
+					continue
+				bound = v + (W - w) * val[next_below] // wt[next_below]
+			else:
+				if next_above is None:
+					continue
+				bound = v + (W - w) * val[next_above] // wt[next_above]
+			if bound > best:
+				kws.append(w)
+				kvs.append(v)
+				kds.append(d)
+				if upper is None or bound > upper:
+					upper = bound
+		ws, vs, ds = kws, kvs, kds
+		# Estados podados ao longo da rodada tinham limite <= um melhor anterior
+		upper = best if upper is None or upper < best else upper
+		yield best, upper, lambda d=best_d: solution(d)
+		if not ws:
+			return
+
+		# Expande o núcleo alternando os lados (ou pelo lado que ainda tem itens);
+		# a intercalação visita os estados e a cópia deslocada inteira
+		if counter is not None:
+			counter.add(2 * len(ws))
+		if (side == 0 and below_heap) or not above_heap:
+			_, i = heapq.heappop(below_heap)
+			ws, vs, ds = merge(ws, vs, ds, wt[i], val[i], i)
+		else:
+			_, i = heapq.heappop(above_heap)
+			ws, vs, ds = merge(ws, vs, ds, -wt[i], -val[i], i)
+		side ^= 1
+
+
+def knapsack_with_items(W, val, wt, counter=None):
+	"""
+	Retorna (max_value, chosen_indices) com índices em ordem crescente.
+	"""
+	for best, _, items in core_rounds(W, val, wt, counter):
+		pass
+	return best, items()
+
+
+def knapsack(W, val, wt, counter=None):
+	"""Wrapper de compatibilidade que retorna apenas o valor máximo (int)."""
+	max_val, _ = knapsack_with_items(W, val, wt, counter=counter)
+	return max_val
+
+
+if __name__ == '__main__':
+	from knapsack_instrument import run
+
+	# Exemplo de demonstração
+	val = [1, 2, 3]
+	wt = [4, 5, 1]
+	W = 4
+
+	result = run(knapsack_with_items, W, val, wt)
+	print(f"Valor máximo: {result.value}")
+	print(f"Índices dos itens escolhidos: {result.chosen}")
+	print(f"Operações: {result.ops}")
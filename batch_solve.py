@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Batch solver for streams of knapsack instances in JSONL.
+
+Each input line is one instance in the format of the input_*.json files,
+{"capacity": int, "items": [{"w": int, "v": int}, ...]}, optionally with an
+"id" (copied to the output) and a "solver" that overrides the automatic
+choice. Items may carry a count of identical copies, {"w", "v", "c"}: such
+instances are solved by the bounded DP of 14_mochila_limitada.py (or, with
+an explicit 0/1 solver, with every copy listed as an item), and their output
+adds "quantities", the copies of each item in the solution.
+
+The automatic choice (choose_solver) only picks an exact solver whose
+predicted cost stays within EXACT_MAX_COST; larger instances go to the
+anytime solver of 15_anytime.py, so no line blocks the stream for an
+unbounded time. The anytime solver stops after the line's "time_limit" in
+seconds (default --time-limit, ANYTIME_TIME_LIMIT) and its output adds
+"upper_bound", "gap" (relative) and "optimal".
+
+Lines are parsed and solved by a pool of worker processes that load
+the solver modules once, so each instance only pays for its own solve
+instead of an interpreter start plus module loading (as with run4.py).
+
+Each output line is a JSON object such as
+  {"index": 0, "id": "a", "value": 43, "chosen": [0, 2, 3], "algo": "core", "time": 0.0001}
+or {"index": 0, "error": "..."} when the line cannot be solved; "index" is the
+position of the instance in the input. Results are written in input order
+(default) or as soon as they complete (--unordered). A summary with the
+throughput in instances per second is printed to stderr.
+
+With --vectorize, lines are sent to the workers in blocks, and the small
+instances of each block (capacity up to VECTOR_MAX_CAPACITY, no explicit
+"solver" other than "batch_dp") are solved together by the batched DP of
+13_pd_lote.py; their "time" is the block's solve time divided among them.
+
+Usage:
+  python batch_solve.py instances.jsonl --output results.jsonl
+  cat instances.jsonl | python batch_solve.py --jobs 4 --unordered
+  python batch_solve.py instances.jsonl --vectorize
+
+  # Generate a stream of random instances to measure throughput
+  python batch_solve.py --generate 1000 --n 50 --capacity 1000 instances.jsonl
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import threading
+import traceback
+import multiprocessing
+
+import knapsack_registry
+
+# Registered solvers that return (value, chosen_indices) (knapsack_registry.py)
+SOLVERS = knapsack_registry.names(items=True)
+
+# Up to this many items meet-in-the-middle is cheap whatever the structure
+# (at most 2^15 states per half); see choose_solver
+MITM_MAX_ITEMS = 30
+
+# --vectorize: lines per block, and the largest capacity solved in batch
+# (wider instances would pad the whole batch to their capacity)
+VECTOR_BLOCK = 2048
+VECTOR_MAX_CAPACITY = 1024
+
+# Largest predicted cost (see predicted_cost) of an automatically chosen
+# exact solver, and the default time limit (seconds) of the anytime solver
+# used beyond it
+EXACT_MAX_COST = 10_000_000
+ANYTIME_TIME_LIMIT = 1.0
+
+# Solver forced for every line of this process, and the anytime time limit
+# of lines without "time_limit" (set by the pool initializer)
+_FORCED = None
+_TIME_LIMIT = ANYTIME_TIME_LIMIT
+
+
+def predicted_cost(name, W, n):
+    """
+    Rough work estimate of solving an instance of n items and capacity W
+    with `name`: DP cells (n x (W + 1)) for the table and core solvers, the
+    states of meet-in-the-middle and brute force, and n for the greedy and
+    anytime solvers (the latter stops at its time limit).
+    """
+    if name in ('greedy', 'anytime'):
+        return n
+    if name == 'meet_in_middle':
+        return n << ((n + 1) // 2)
+    if name == 'brute_force':
+        return n << n
+    return n * (max(W, 0) + 1)
+
+
+def choose_solver(W, val, wt, cnt=None, max_cost=EXACT_MAX_COST):
+    """
+    Picks a solver from the instance size:
+    - every item fits: the greedy solution takes them all and is optimal;
+    - up to MITM_MAX_ITEMS items: meet-in-the-middle, whose cost does not
+      depend on W or on how the values correlate with the weights;
+    - otherwise the core solver (bounded_dp when items have counts `cnt`),
+      which on the scaling sweep families beats the O(n x W) tables by one
+      to two orders of magnitude, as long as its worst case n x (W + 1)
+      stays within `max_cost`;
+    - beyond that, the anytime solver: the exact core search stopped at the
+      time limit, with the gap to the proven upper bound.
+    """
+    if cnt is not None:
+        name = 'bounded_dp'
+    else:
+        fit = [i for i in range(len(val)) if wt[i] <= W and val[i] > 0]
+        if sum(wt[i] for i in fit) <= W:
+            return 'greedy'
+        if len(fit) <= MITM_MAX_ITEMS:
+            return 'meet_in_middle'
+        name = 'core'
+    if max_cost is not None and predicted_cost(name, W, len(val)) > max_cost:
+        return 'anytime'
+    return name
+
+
+def init_worker(solver=None, time_limit=ANYTIME_TIME_LIMIT):
+    """
+    Prepares a worker process: `solver` is used for every line without its
+    own "solver" (None: choose_solver), `time_limit` bounds the anytime
+    solves of lines without "time_limit", and every solver is imported.
+    """
+    global _FORCED, _TIME_LIMIT
+    _FORCED = solver
+    _TIME_LIMIT = time_limit
+    # Load every solver up front so that the first instances are not slower
+    for name in SOLVERS:
+        knapsack_registry.load(name)
+
+
+def parse_instance(req):
+    """
+    (W, val, wt, cnt) of a request object in the input_*.json format; cnt is
+    None unless some item has a count "c" other than 1.
+    """
+    items = req.get('items', [])
+    cnt = [int(it.get('c', 1)) for it in items]
+    if all(c == 1 for c in cnt):
+        cnt = None
+    return int(req.get('capacity', 0)), [int(it['v']) for it in items], [int(it['w']) for it in items], cnt
+
+
+def error_output(out, e):
+    """Adds the message of exception `e` to output dict `out`; returns (False, JSON line)."""
+    out['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
+    return False, json.dumps(out)
+
+
+def _new_output(index, req):
+    out = {'index': index}
+    if isinstance(req, dict) and 'id' in req:
+        out['id'] = req['id']
+    return out
+
+
+def _solve_line(task):
+    index, line = task
+    try:
+        req = json.loads(line)
+    except Exception as e:
+        return error_output({'index': index}, e)
+    return solve_request(index, req)
+
+
+def solve_request(index, req, instance=None):
+    """
+    Solves request object `req` (the instance from parse_instance, unless
+    given) and returns (ok, JSON output line) with "index" set to `index`.
+    """
+    out = _new_output(index, req)
+    try:
+        W, val, wt, cnt = instance if instance is not None else parse_instance(req)
+        name = req.get('solver') or _FORCED or choose_solver(W, val, wt, cnt)
+        if name not in SOLVERS:
+            raise ValueError(f"unknown solver {name!r}; choose from {sorted(SOLVERS)}")
+
+        t0 = time.perf_counter()
+        bound = None
+        if cnt is not None and name != 'bounded_dp':
+            # 0/1 solvers get every copy as a separate item
+            owner = [i for i, c in enumerate(cnt) for _ in range(c)]
+            items = (W, [val[i] for i in owner], [wt[i] for i in owner])
+        else:
+            items = (W, val, wt)
+        if name == 'anytime':
+            time_limit = req.get('time_limit', _TIME_LIMIT)
+            bound = knapsack_registry.load(name).knapsack_anytime(*items, time_limit=time_limit)
+            value, chosen = bound['value'], bound['chosen']
+        elif name == 'bounded_dp' and cnt is not None:
+            value, quantities = knapsack_registry.load(name).knapsack_with_quantities(W, val, wt, cnt)
+        else:
+            value, chosen = knapsack_registry.function(name, with_items=True)(*items)
+        if cnt is not None and name != 'bounded_dp':
+            quantities = [0] * len(val)
+            for p in chosen:
+                quantities[owner[p]] += 1
+        elapsed = time.perf_counter() - t0
+        if cnt is None:
+            out.update(value=int(value), chosen=sorted(chosen), algo=name, time=elapsed)
+        else:
+            out.update(value=int(value), chosen=[i for i, q in enumerate(quantities) if q], quantities=quantities,
+                       algo=name, time=elapsed)
+        if bound is not None:
+            out.update(upper_bound=bound['upper_bound'], gap=bound['rel_gap'], optimal=bound['optimal'])
+    except Exception as e:
+        return error_output(out, e)
+    return True, json.dumps(out)
+
+
+def _solve_block(block):
+    # --vectorize: the small instances of the block go through one batched
+    # DP call; the others (and malformed lines) are solved one by one
+    outs = [None] * len(block)
+    batch = []  # (position in block, index, request, instance)
+    for k, (index, line) in enumerate(block):
+        try:
+            req = json.loads(line)
+            instance = parse_instance(req)
+        except Exception:
+            outs[k] = _solve_line((index, line))
+            continue
+        name = req.get('solver') or _FORCED
+        if name in (None, 'batch_dp') and 0 <= instance[0] <= VECTOR_MAX_CAPACITY and instance[3] is None:
+            batch.append((k, index, req, instance))
+        else:
+            outs[k] = solve_request(index, req, instance)
+    if not batch:
+        return outs
+
+    solve = knapsack_registry.load('batch_dp').knapsack_batch
+    t0 = time.perf_counter()
+    try:
+        solved = solve([instance[:3] for _, _, _, instance in batch], with_items=True)
+    except Exception:
+        # e.g. values beyond int64: fall back to the per-instance solvers
+        for k, index, req, instance in batch:
+            outs[k] = solve_request(index, req, instance)
+        return outs
+    each = (time.perf_counter() - t0) / len(batch)
+    for (k, index, req, _), (value, chosen) in zip(batch, solved):
+        out = _new_output(index, req)
+        out.update(value=int(value), chosen=chosen, algo='batch_dp', time=each)
+        outs[k] = True, json.dumps(out)
+    return outs
+
+
+def _blocks(tasks, size):
+    while True:
+        block = list(itertools.islice(tasks, size))
+        if not block:
+            return
+        yield block
+
+
+def solve_stream(lines, jobs=None, ordered=True, solver=None, chunksize=4, vectorize=0,
+                 time_limit=ANYTIME_TIME_LIMIT):
+    """
+    Solves every non-blank JSONL line of `lines` and yields (ok, output_line)
+    pairs (JSON strings, without newline) in input order, or as they complete
+    when `ordered` is false. At most a few chunks per worker are read ahead, so
+    arbitrarily long streams run in bounded memory. With `vectorize` > 0 the
+    lines go to the workers in blocks of that many (see _solve_block).
+    `time_limit` (seconds) bounds the anytime solves of lines without
+    "time_limit"; None lets them run until the optimum is proven.
+    """
+    tasks = enumerate(line for line in lines if line.strip())
+    work = _solve_line
+    if vectorize:
+        tasks = _blocks(tasks, vectorize)
+        work = _solve_block
+        chunksize = 1
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        init_worker(solver, time_limit)
+        for out in map(work, tasks):
+            if vectorize:
+                yield from out
+            else:
+                yield out
+        return
+
+    window = threading.BoundedSemaphore(4 * jobs * chunksize)
+    stopped = threading.Event()
+
+    def feed():
+        # Runs in the pool's task-feeding thread; blocks while the window is full
+        for task in tasks:
+            while not window.acquire(timeout=0.1):
+                if stopped.is_set():
+                    return
+            yield task
+
+    with multiprocessing.Pool(jobs, initializer=init_worker, initargs=(solver, time_limit)) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        try:
+            for out in mapper(work, feed(), chunksize):
+                window.release()
+                if vectorize:
+                    yield from out
+                else:
+                    yield out
+        finally:
+            stopped.set()
+
+
+def write_example_stream(path, count, n=10, capacity=50, max_w=20, max_v=100, seed=None):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for k in range(count):
+            items = [{'w': rng.randint(1, max_w), 'v': rng.randint(1, max_v)} for _ in range(n)]
+            f.write(json.dumps({'id': k, 'capacity': capacity, 'items': items}) + '\n')
+    print(f"Wrote {count} instance(s) to {path} (n={n}, capacity={capacity})")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Solve a JSONL stream of knapsack instances with a worker pool')
+    p.add_argument('input', nargs='?', default='-', help="JSONL file with one instance per line ('-' for stdin)")
+    p.add_argument('--output', '-o', default='-', help="JSONL file for the results ('-' for stdout)")
+    p.add_argument('--jobs', '-j', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    p.add_argument('--unordered', action='store_true', help='Write results as they complete instead of in input order')
+    p.add_argument('--solver', choices=sorted(SOLVERS), default=None, help='Use this solver for every line (default: chosen per instance)')
+    p.add_argument('--time-limit', type=float, default=ANYTIME_TIME_LIMIT,
+                   help=f'Seconds of an anytime solve for lines without "time_limit" (default {ANYTIME_TIME_LIMIT}; 0: none)')
+    p.add_argument('--chunksize', type=int, default=4, help='Instances sent to a worker at a time')
+    p.add_argument('--vectorize', type=int, nargs='?', const=VECTOR_BLOCK, default=0, metavar='BLOCK',
+                   help=f'Solve small instances in batches with 13_pd_lote.py, BLOCK lines at a time (default {VECTOR_BLOCK})')
+    p.add_argument('--generate', type=int, metavar='COUNT', default=None, help='Write COUNT random instances to INPUT and exit')
+    p.add_argument('--n', type=int, default=10, help='Number of items per generated instance')
+    p.add_argument('--capacity', type=int, default=50, help='Capacity of the generated instances')
+    p.add_argument('--max-weight', type=int, default=20, help='Max item weight when generating')
+    p.add_argument('--max-value', type=int, default=100, help='Max item value when generating')
+    p.add_argument('--seed', type=int, default=None, help='Random seed for generation')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.generate is not None:
+        if args.input == '-':
+            print('--generate needs an output path as INPUT')
+            sys.exit(1)
+        write_example_stream(args.input, args.generate, n=args.n, capacity=args.capacity, max_w=args.max_weight,
+                             max_v=args.max_value, seed=args.seed)
+        return
+
+    src = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    count = errors = 0
+    start = time.perf_counter()
+    try:
+        for ok, out in solve_stream(src, jobs=args.jobs, ordered=not args.unordered, solver=args.solver,
+                                    chunksize=args.chunksize, vectorize=args.vectorize,
+                                    time_limit=args.time_limit or None):
+            dst.write(out + '\n')
+            count += 1
+            errors += not ok
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"Solved {count} instance(s) ({errors} error(s)) in {elapsed:.3f}s: {rate:.1f} instances/s",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,106 +8,600 @@ Usage examples:
   # Generate random instance (n items) and run
   python knapsack_benchmark.py --generate --n 25 --capacity 100 --output results.csv
 
-The script will attempt to load the four implementations located in the same
-directory as this script (`1.py`, `2.py`, `3.py`, `4.py`) and call the
-function `knapsack(W, val, wt)` exported by each module. Because filenames
-start with digits, modules are loaded by file path using importlib utilities.
+  # Huge instances: generate straight to the binary format (see knapsack_io.py)
+  python knapsack_benchmark.py --generate --input big.bin --n 10000000 --capacity 1000
+
+  # Sweep several inputs on 4 cores, killing any run that exceeds 60 s
+  python knapsack_benchmark.py --input input_*.json --jobs 4 --timeout 60
+
+  # Check a new results file against a stored baseline (exit code 1 on a
+  # statistically significant slowdown)
+  python knapsack_benchmark.py --compare baseline.csv results.csv
+
+The implementations are the benchmarked entries of the solver registry
+(knapsack_registry.py, listed in `IMPLEMENTATIONS`); each run calls the
+function `knapsack(W, val, wt)` exported by its module. The main process
+never imports them: each worker imports a module on its first run and keeps
+it loaded, and the `load_time` column records the seconds that import took
+in the worker (the startup cost that a one-shot process would pay per run),
+plus the imports of the solvers that a dispatching implementation such as
+7_pd_auto.py loads on its first call.
+
+Every run happens in a worker process taken from a reusable pool
+(`WorkerPool`). A run that passes its deadline has its worker killed and
+replaced, so the timeout is a hard limit; independent (implementation, input)
+pairs run concurrently on up to `--jobs` workers. Each row records the peak
+resident memory of the run and how the worker finished (`exit_cause`).
+
+Inside the worker each implementation gets `--warmup` untimed calls and is
+then repeated until the standard error of the mean falls below
+`--target-error` (relative), within `--min-reps`/`--max-reps` and a per-run
+`--time-budget`. Repetitions also stop before they would cross the
+`--timeout` deadline, and a warmup call slower than the budget (or half the
+timeout) becomes the only, cold, sample instead of being repeated; the
+`warmup_runs` column records how many warmup calls actually ran. The CSV keeps min/median/p95/mean/std of the samples (and
+the samples themselves); the `time` column holds the median. Timed calls
+never count operations; with `--count-ops` one extra counted call per run
+fills the `ops` column (see knapsack_instrument.py).
+
+With `--cache` (or `--cache-db PATH` for a shared sqlite tier) each worker
+keeps a content-addressed result cache (knapsack_cache.py). The timing
+columns always measure the uncached solver; after the timed calls, each run
+looks its instance up once (storing the measured result on a miss), and the
+cache_hits/cache_disk_hits/cache_misses and cache_lookup_time columns record
+that lookup.
 
 The script saves timing results to a CSV and prints a short summary.
 """
 import argparse
-import json
+import glob
 import os
+import sys
 import time
 import csv
 import random
 import traceback
-import importlib.util
+import math
+import multiprocessing
+import multiprocessing.connection
 import types
 
+import knapsack_cache
+import knapsack_instrument
+import knapsack_io
+import knapsack_reduce
+import knapsack_registry
+
 
-def load_module_from_path(name, path):
-    spec = importlib.util.spec_from_file_location(name, path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+# (impl name, implementation file) in benchmark order
+IMPLEMENTATIONS = [(spec.impl, spec.filename) for spec in knapsack_registry.specs(benchmarked=True)]
 
 
-def load_implementations(base_dir):
+def load_implementations(base_dir, cache=None):
+    # Returns (name, fn, path, spec) tuples; fn imports its module on the
+    # first call. With a knapsack_cache.ResultCache, every call goes through it
     impls = []
-    for i in range(1, 5):
-        filename = os.path.join(base_dir, f"{i}.py")
+    for spec in knapsack_registry.specs(benchmarked=True):
+        filename = spec.path(base_dir)
         if os.path.exists(filename):
-            try:
-                mod = load_module_from_path(f"impl_{i}", filename)
-                if hasattr(mod, 'knapsack'):
-                    impls.append((f"impl_{i}", mod.knapsack, filename))
-                else:
-                    print(f"Warning: {filename} has no `knapsack` function")
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
+            fn = spec.lazy(base_dir=base_dir)
+            impls.append((spec.impl, fn if cache is None else cache.wrap(fn), filename, spec))
         else:
             print(f"Note: {filename} not found; skipping")
     return impls
 
 
-def read_input(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    # Expect {"capacity": int, "items": [{"w":int, "v":int}, ...]}
-    cap = int(data.get('capacity', 0))
-    items = data.get('items', [])
-    val = [int(it['v']) for it in items]
-    wt = [int(it['w']) for it in items]
-    return cap, val, wt
+def read_input(path, backend='list'):
+    # JSON {"capacity": int, "items": [{"w":int, "v":int}, ...]} is parsed
+    # incrementally into typed columns; binary instances are read directly.
+    # Lists keep the solvers' inner loops on plain Python ints.
+    return knapsack_io.read_instance(path, backend=backend)
 
 
 def write_example_input(path, n=10, capacity=50, max_w=20, max_v=100, seed=None):
     if seed is not None:
         random.seed(seed)
-    items = []
-    for _ in range(n):
-        w = random.randint(1, max_w)
-        v = random.randint(1, max_v)
-        items.append({"w": w, "v": v})
-    data = {"capacity": capacity, "items": items}
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    # Items are generated lazily and streamed to disk ('.bin' writes binary)
+    items = ((random.randint(1, max_w), random.randint(1, max_v)) for _ in range(n))
+    knapsack_io.write_instance(path, capacity, items)
     print(f"Wrote example input to {path} (n={n}, capacity={capacity})")
 
 
-def benchmark(impls, cap, val, wt, timeout=None):
-    # Run each implementation and time it. timeout (seconds) not enforced per-call,
-    # but we abort if a single run takes longer than timeout (checked after run).
-    results = []
-    for name, fn, src in impls:
-        record = {"impl": name, "capacity": cap, "n_items": len(val), "status": "ok", "time": None, "result": None, "error": None}
-        try:
+def _reset_peak_rss():
+    # Linux: writing 5 to clear_refs resets VmHWM, so a reused worker reports
+    # the peak of the current run only
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss_kb():
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        # Windows: no resource module
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+# Default repetition policy (see parse_args for the matching CLI options)
+TIMING = {'warmup': 1, 'min_reps': 3, 'max_reps': 100, 'target_error': 0.02, 'time_budget': 2.0}
+
+
+def _limit_memory(limit_mb):
+    # Caps the worker's address space so that an oversized table raises
+    # MemoryError (reported as 'error') instead of waking the OOM killer
+    try:
+        import resource
+    except ImportError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = resource.RLIM_INFINITY if limit_mb is None else limit_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY and (soft == resource.RLIM_INFINITY or soft > hard):
+        soft = hard
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _new_record(task):
+    return {"impl": task['impl'], "input": task.get('input'), "capacity": task['cap'], "n_items": len(task['val']),
+            "status": "ok", "time": None, "warmup_runs": None, "result": None, "ops": None, "algo": None, "load_time": None,
+            "peak_rss_kb": None, "exit_cause": None, "error": None}
+
+
+# Result cache of this worker process, kept across tasks: (config, cache)
+_WORKER_CACHE = [None, None]
+
+
+def _worker_cache(config):
+    # config is (max_bytes, sqlite path or None)
+    if _WORKER_CACHE[0] != config:
+        if _WORKER_CACHE[1] is not None:
+            _WORKER_CACHE[1].close()
+        _WORKER_CACHE[:] = [config, knapsack_cache.ResultCache(max_bytes=config[0], path=config[1])]
+    return _WORKER_CACHE[1]
+
+
+def percentile(sorted_xs, q):
+    """q-quantile (q in [0, 1]) of sorted samples, interpolating between closest ranks."""
+    pos = (len(sorted_xs) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_xs) - 1)
+    return sorted_xs[lo] + (sorted_xs[hi] - sorted_xs[lo]) * (pos - lo)
+
+
+def summarize_times(times):
+    # Stats stored in the CSV for a list of per-call timings (seconds)
+    xs = sorted(times)
+    n = len(xs)
+    mean = sum(xs) / n
+    std = math.sqrt(sum((x - mean) ** 2 for x in xs) / (n - 1)) if n > 1 else 0.0
+    return {'time': percentile(xs, 0.5), 'time_min': xs[0], 'time_median': percentile(xs, 0.5),
+            'time_p95': percentile(xs, 0.95), 'time_mean': mean, 'time_std': std, 'reps': n,
+            'rel_err': (std / math.sqrt(n)) / mean if n > 1 and mean > 0 else None,
+            'samples': ';'.join(f"{x:.9g}" for x in times)}
+
+
+def _timed_calls(fn, args, timing, timeout=None):
+    """
+    Returns (result, timed samples, warmup calls run). A warmup call slower
+    than the time budget (or half of `timeout`, the seconds left before the
+    worker is killed) is not repeated: it becomes the only sample. No call
+    starts once the previous one predicts that it would cross the deadline.
+    """
+    start = time.perf_counter()
+    slow = timing['time_budget'] if timeout is None else min(timing['time_budget'], timeout / 2)
+
+    def fits(last):
+        return timeout is None or time.perf_counter() - start + last < timeout
+
+    warmups = 0
+    for _ in range(timing['warmup']):
+        t0 = time.perf_counter()
+        res = fn(*args)
+        elapsed = time.perf_counter() - t0
+        if elapsed > slow or not fits(elapsed):
+            # Too slow to repeat: this (cold) call is the measurement
+            return res, [elapsed], warmups
+        warmups += 1
+
+    times = []
+    spent = 0.0
+    while True:
+        t0 = time.perf_counter()
+        res = fn(*args)
+        elapsed = time.perf_counter() - t0
+        times.append(elapsed)
+        spent += elapsed
+        if len(times) >= timing['max_reps'] or spent >= timing['time_budget'] or not fits(elapsed):
+            break
+        if len(times) >= timing['min_reps']:
+            rel_err = summarize_times(times)['rel_err']
+            if rel_err is not None and rel_err <= timing['target_error']:
+                break
+    return res, times, warmups
+
+
+def _run_task(task):
+    # Executed inside a worker: load (once per worker) and time one implementation
+    started = time.monotonic()
+    record = _new_record(task)
+    _limit_memory(task.get('memory_limit_mb'))
+    _reset_peak_rss()
+    try:
+        spec = knapsack_registry.get(task['impl'])
+        base_dir = os.path.dirname(task['src'])
+        loaded = knapsack_registry.load_times()
+        mod = spec.load(base_dir)
+        record['load_time'] = spec.load_time(base_dir)
+        fn = spec.function(base_dir=base_dir)
+        if task.get('reduce'):
+            fn = knapsack_reduce.with_reduction(fn)
+        # Seconds left before the pool kills this worker (imports included)
+        timeout = task.get('timeout')
+        if timeout is not None:
+            timeout -= time.monotonic() - started
+        res, times, record['warmup_runs'] = _timed_calls(fn, (task['cap'], task['val'], task['wt']),
+                                                         task.get('timing', TIMING), timeout)
+        record.update(summarize_times(times))
+        # Dispatching solvers import the solvers they call on their first call
+        record['load_time'] += sum(t for f, t in knapsack_registry.load_times().items()
+                                   if f not in loaded and f != spec.filename)
+        if task.get('cache') is not None:
+            # The timed calls never go through the cache; one lookup of the
+            # instance (storing the measured result on a miss) is timed apart
+            cache = _worker_cache(task['cache'])
+            before = cache.stats()
+            namespace = f"benchmark:{task['impl']}" + (':reduce' if task.get('reduce') else '')
             t0 = time.perf_counter()
-            res = fn(cap, val, wt)
-            t1 = time.perf_counter()
-            elapsed = t1 - t0
-            record['time'] = elapsed
-            record['result'] = res
-            if timeout is not None and elapsed > timeout:
-                record['status'] = 'timeout'
-        except RecursionError as re:
-            record['status'] = 'recursion_error'
-            record['error'] = str(re)
-        except Exception as e:
-            record['status'] = 'error'
-            record['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
-        results.append(record)
-        print(f"{name}: status={record['status']} time={record['time']} result={record['result']}")
+            cache.solve(lambda W, val, wt: res, task['cap'], task['val'], task['wt'], namespace=namespace)
+            record['cache_lookup_time'] = time.perf_counter() - t0
+            record.update({k: v - before[k] for k, v in cache.stats().items()})
+        record['result'] = res
+        # The counted call is skipped when it would not finish before the deadline
+        in_time = timeout is None or time.monotonic() - started + max(times) < task['timeout']
+        if task.get('count_ops') and in_time:
+            # Separate call so that the timed samples carry no counting cost
+            record['ops'] = knapsack_instrument.run(fn, task['cap'], task['val'], task['wt']).ops
+        # Dispatching implementations report which algorithm runs on the
+        # instance they were given (the reduced one with --reduce)
+        choose = getattr(mod, 'choose', None)
+        if choose is not None:
+            instance = (task['cap'], task['val'], task['wt'])
+            if task.get('reduce'):
+                red = knapsack_reduce.reduce_instance(*instance)
+                instance = (red.W, red.val, red.wt)
+            record['algo'] = choose(*instance)
+        record['exit_cause'] = 'returned'
+    except RecursionError as re:
+        record['status'] = 'recursion_error'
+        record['error'] = str(re)
+        record['exit_cause'] = 'raised'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        record['exit_cause'] = 'raised'
+    record['peak_rss_kb'] = _peak_rss_kb()
+    return record
+
+
+def _worker_main(conn):
+    # Imported modules stay in the registry for the life of the worker
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        conn.send(_run_task(task))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        # Not a daemon: implementations such as 12_pd_paralela start their own
+        # processes. An orphaned worker exits when its pipe reaches EOF.
+        self.proc = ctx.Process(target=_worker_main, args=(child,))
+        self.proc.start()
+        child.close()
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Reusable pool of benchmark worker processes. Unlike multiprocessing.Pool,
+    a task that exceeds its deadline is stopped by killing its worker, which
+    is then replaced by a fresh one.
+    """
+
+    def __init__(self, size):
+        self._ctx = multiprocessing.get_context()
+        self.size = max(1, size)
+        self._workers = [_Worker(self._ctx) for _ in range(self.size)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for w in self._workers:
+            try:
+                w.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for w in self._workers:
+            w.proc.join(timeout=1)
+            if w.proc.is_alive():
+                w.kill()
+        self._workers = []
+
+    def _replace(self, worker):
+        worker.kill()
+        fresh = _Worker(self._ctx)
+        self._workers[self._workers.index(worker)] = fresh
+        return fresh
+
+    def run(self, tasks, timeout=None):
+        """
+        Runs every task and yields (index, record) pairs as they complete.
+        `timeout` (seconds) is enforced per task.
+        """
+        pending = list(enumerate(tasks))
+        pending.reverse()
+        idle = list(self._workers)
+        busy = {}  # conn -> (worker, index, task, start)
+
+        while pending or busy:
+            while pending and idle:
+                worker = idle.pop()
+                index, task = pending.pop()
+                worker.conn.send(task)
+                busy[worker.conn] = (worker, index, task, time.monotonic())
+
+            wait = None
+            if timeout is not None:
+                first_start = min(start for _, _, _, start in busy.values())
+                wait = max(0.0, first_start + timeout - time.monotonic())
+            for conn in multiprocessing.connection.wait(list(busy), timeout=wait):
+                worker, index, task, start = busy.pop(conn)
+                try:
+                    record = conn.recv()
+                except (EOFError, OSError):
+                    # The worker died mid-run (e.g. killed by the OOM killer)
+                    exitcode = worker.proc.exitcode
+                    record = _new_record(task)
+                    record['status'] = 'crashed'
+                    record['time'] = time.monotonic() - start
+                    record['exit_cause'] = f'exit code {exitcode}'
+                    worker = self._replace(worker)
+                idle.append(worker)
+                yield index, record
+
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            for conn, (worker, index, task, start) in list(busy.items()):
+                if now - start >= timeout:
+                    del busy[conn]
+                    record = _new_record(task)
+                    record['status'] = 'timeout'
+                    record['time'] = now - start
+                    record['exit_cause'] = 'killed'
+                    idle.append(self._replace(worker))
+                    yield index, record
+
+
+def make_tasks(impls, cap, val, wt, input_name=None, reduce=False, timing=None, memory_limit_mb=None,
+               count_ops=False, cache=None):
+    # cache: None, or (max_bytes, sqlite path or None) for the workers' result cache
+    timing = dict(TIMING, **(timing or {}))
+    return [{'impl': name, 'src': src, 'input': input_name, 'cap': cap, 'val': val, 'wt': wt, 'reduce': reduce,
+             'timing': timing, 'memory_limit_mb': memory_limit_mb, 'count_ops': count_ops, 'cache': cache}
+            for name, fn, src, spec in impls]
+
+
+def run_tasks(tasks, timeout=None, jobs=None):
+    # Run tasks concurrently in isolated workers; rows come back in task order
+    jobs = jobs or os.cpu_count() or 1
+    # Workers size their repetitions to finish before the deadline
+    tasks = [dict(task, timeout=timeout) for task in tasks]
+    results = [None] * len(tasks)
+    with WorkerPool(min(jobs, len(tasks))) as pool:
+        for index, record in pool.run(tasks, timeout=timeout):
+            results[index] = record
+            ops = f" ops={record['ops']}" if record.get('ops') is not None else ''
+            if record.get('cache_misses') is not None:
+                ops += (f" cache_hits={record['cache_hits']} cache_disk_hits={record['cache_disk_hits']}"
+                        f" cache_misses={record['cache_misses']}")
+            print(f"{record['impl']} [{record['input']}]: status={record['status']} time={record['time']} "
+                  f"reps={record.get('reps')} result={record['result']}{ops} load_time={record['load_time']} "
+                  f"peak_rss_kb={record['peak_rss_kb']}")
     return results
 
 
+def benchmark(impls, cap, val, wt, timeout=None, jobs=None, reduce=False, input_name=None, timing=None,
+              count_ops=False, cache=None):
+    # Run each implementation in its own worker process and time it; runs that
+    # exceed timeout (seconds) are killed and reported as 'timeout'.
+    if not impls:
+        return []
+    return run_tasks(make_tasks(impls, cap, val, wt, input_name, reduce, timing, count_ops=count_ops, cache=cache),
+                     timeout=timeout, jobs=jobs)
+
+
+def _betacf(a, b, x):
+    # Continued fraction for the regularized incomplete beta (Numerical Recipes)
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 200):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _t_sf(t, df):
+    # One-sided p-value P(T > t) of Student's t distribution
+    x = df / (df + t * t)
+    lbeta = math.lgamma(df / 2) + math.lgamma(0.5) - math.lgamma(df / 2 + 0.5)
+    front = math.exp(math.log(x) * df / 2 + math.log(1 - x) * 0.5 - lbeta)
+    if x < (df / 2 + 1) / (df / 2 + 0.5 + 2):
+        tail = front * _betacf(df / 2, 0.5, x) / (df / 2)
+    else:
+        tail = 1.0 - front * _betacf(0.5, df / 2, 1 - x) / 0.5
+    return tail / 2 if t > 0 else 1.0 - tail / 2
+
+
+def mann_whitney_slowdown_pvalue(base, new):
+    # One-sided Mann-Whitney U test of H1: new timings tend to be larger.
+    # Normal approximation with tie correction; robust to timing outliers.
+    n1, n2 = len(base), len(new)
+    if n1 < 2 or n2 < 2:
+        return None
+    pooled = sorted([(x, 0) for x in base] + [(x, 1) for x in new])
+    rank_new = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            j += 1
+        avg_rank = (i + j + 1) / 2  # ranks are 1-based
+        rank_new += avg_rank * sum(1 for k in range(i, j) if pooled[k][1] == 1)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+    u = rank_new - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def welch_slowdown_pvalue(base, new):
+    # One-sided Welch test of H1: mean(new) > mean(base); None without spread
+    n1, n2 = base['reps'], new['reps']
+    if n1 < 2 or n2 < 2:
+        return None
+    v1 = base['time_std'] ** 2 / n1
+    v2 = new['time_std'] ** 2 / n2
+    if v1 + v2 == 0:
+        return 0.0 if new['time_mean'] > base['time_mean'] else 1.0
+    t = (new['time_mean'] - base['time_mean']) / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / ((v1 ** 2 / (n1 - 1) if n1 > 1 else 0) + (v2 ** 2 / (n2 - 1) if n2 > 1 else 0))
+    return _t_sf(t, df)
+
+
+def _load_stats(path):
+    # Last successful row per (impl, input, capacity, n_items) with timing stats
+    rows = {}
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row.get('status') != 'ok' or not row.get('time_mean'):
+                continue
+            key = (row['impl'], row.get('input', ''), row['capacity'], row['n_items'])
+            samples = [float(x) for x in row.get('samples', '').split(';') if x]
+            rows[key] = {'time_median': float(row['time_median']), 'time_mean': float(row['time_mean']),
+                         'time_std': float(row['time_std'] or 0.0), 'reps': int(row['reps']), 'samples': samples}
+    return rows
+
+
+def compare_results(baseline_path, new_path, alpha=0.01, threshold=0.05):
+    """
+    Compares the timing stats of two results files. A row is a regression when
+    its median is more than `threshold` (relative) slower than the baseline
+    and a one-sided test rejects "not slower" at level `alpha`: Mann-Whitney
+    on the stored samples, or Welch on mean/std for files without samples.
+    Returns the list of regressions as (key, ratio, p_value).
+    """
+    base = _load_stats(baseline_path)
+    new = _load_stats(new_path)
+    regressions = []
+    for key in sorted(set(base) & set(new)):
+        b, n = base[key], new[key]
+        ratio = n['time_median'] / b['time_median'] if b['time_median'] > 0 else float('inf')
+        if b['samples'] and n['samples']:
+            p = mann_whitney_slowdown_pvalue(b['samples'], n['samples'])
+        else:
+            p = welch_slowdown_pvalue(b, n)
+        flag = ''
+        if p is not None and p < alpha and ratio > 1 + threshold:
+            regressions.append((key, ratio, p))
+            flag = '  <-- REGRESSION'
+        p_text = 'n/a' if p is None else f"{p:.3g}"
+        print(f"{key[0]} [{key[1]}] cap={key[2]} n={key[3]}: x{ratio:.3f} (p={p_text}){flag}")
+    missing = sorted(set(base) - set(new))
+    for key in missing:
+        print(f"{key[0]} [{key[1]}] cap={key[2]} n={key[3]}: missing from {new_path}")
+    print(f"{len(regressions)} regression(s) out of {len(set(base) & set(new))} compared row(s)")
+    return regressions
+
+
+def _upgrade_csv_header(path, keys):
+    # Older results files lack newer columns; rewrite them with the current
+    # header (missing fields left blank) so appended rows stay aligned
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames or []
+        if header == keys:
+            return
+        old_rows = list(reader)
+    fieldnames = keys + [k for k in header if k not in keys]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for r in old_rows:
+            writer.writerow({k: r.get(k, '') for k in fieldnames})
+    print(f"Upgraded header of {path} to {fieldnames}")
+
+
 def save_results_csv(path, rows):
-    keys = ['impl', 'capacity', 'n_items', 'status', 'time', 'result', 'error']
+    keys = ['impl', 'input', 'capacity', 'n_items', 'status', 'time', 'time_min', 'time_median', 'time_p95',
+            'time_mean', 'time_std', 'reps', 'warmup_runs', 'rel_err', 'result', 'ops', 'algo', 'cache_hits', 'cache_disk_hits',
+            'cache_misses', 'cache_lookup_time', 'load_time', 'peak_rss_kb', 'exit_cause', 'error',
+            'samples']
     write_header = True
     # If the file exists and has content, append without writing the header
     if os.path.exists(path) and os.path.getsize(path) > 0:
         write_header = False
+        _upgrade_csv_header(path, keys)
 
     # Open in append mode so existing rows are preserved
     with open(path, 'a', newline='', encoding='utf-8') as f:
@@ -124,7 +618,7 @@ def save_results_csv(path, rows):
 
 def parse_args():
     p = argparse.ArgumentParser(description='Knapsack implementations benchmark runner')
-    p.add_argument('--input', '-i', default='input.json', help='Path to input JSON file')
+    p.add_argument('--input', '-i', nargs='+', default=['input.json'], help='Path(s) or glob pattern(s) of input JSON files')
     p.add_argument('--generate', action='store_true', help='Generate a new input file and exit')
     p.add_argument('--n', type=int, default=10, help='Number of items to generate')
     p.add_argument('--capacity', type=int, default=50, help='Knapsack capacity to generate/use')
@@ -132,31 +626,74 @@ def parse_args():
     p.add_argument('--max-value', type=int, default=100, help='Max item value when generating')
     p.add_argument('--seed', type=int, default=None, help='Random seed for generation')
     p.add_argument('--output', '-o', default='results.csv', help='CSV path to write results')
-    p.add_argument('--timeout', type=float, default=10.0, help='Per-implementation soft timeout in seconds (reported only)')
+    p.add_argument('--timeout', type=float, default=10.0, help='Per-run hard timeout in seconds; the worker is killed at the deadline')
+    p.add_argument('--jobs', '-j', type=int, default=None, help='Number of worker processes (default: number of CPUs)')
+    p.add_argument('--memory-limit', type=int, default=None, help='Per-worker address-space limit in MB (POSIX only)')
+    p.add_argument('--warmup', type=int, default=TIMING['warmup'], help='Untimed calls before measuring')
+    p.add_argument('--min-reps', type=int, default=TIMING['min_reps'], help='Minimum timed repetitions')
+    p.add_argument('--max-reps', type=int, default=TIMING['max_reps'], help='Maximum timed repetitions')
+    p.add_argument('--target-error', type=float, default=TIMING['target_error'], help='Stop repeating once the relative standard error of the mean is below this')
+    p.add_argument('--time-budget', type=float, default=TIMING['time_budget'], help='Stop repeating once timed calls add up to this many seconds')
+    p.add_argument('--compare', nargs=2, metavar=('BASELINE', 'NEW'), default=None, help='Compare two results files and exit non-zero on a significant slowdown')
+    p.add_argument('--alpha', type=float, default=0.01, help='Significance level for --compare')
+    p.add_argument('--threshold', type=float, default=0.05, help='Minimum relative slowdown of the median reported by --compare')
+    p.add_argument('--reduce', action='store_true', help='Run every implementation on the reduced instance (see knapsack_reduce.py)')
+    p.add_argument('--count-ops', action='store_true', help='Record operation counts from one extra, untimed counted call per run')
+    p.add_argument('--cache', action='store_true', help='Answer repeated instances from an in-memory result cache in each worker')
+    p.add_argument('--cache-db', default=None, help='sqlite file for an on-disk result cache shared by the workers (implies --cache)')
+    p.add_argument('--cache-size', type=int, default=64, help='Memory budget of each worker result cache in MB')
     return p.parse_args()
 
 
+def expand_inputs(patterns):
+    # Shells such as PowerShell do not expand globs, so expand them here
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+
 def main():
     args = parse_args()
     base_dir = os.path.dirname(os.path.abspath(__file__))
 
+    if args.compare:
+        regressions = compare_results(args.compare[0], args.compare[1], alpha=args.alpha, threshold=args.threshold)
+        sys.exit(1 if regressions else 0)
+
     if args.generate:
-        write_example_input(args.input, n=args.n, capacity=args.capacity, max_w=args.max_weight, max_v=args.max_value, seed=args.seed)
+        write_example_input(args.input[0], n=args.n, capacity=args.capacity, max_w=args.max_weight, max_v=args.max_value, seed=args.seed)
         print("Generation complete. Run without --generate to benchmark the implementations.")
         return
 
-    if not os.path.exists(args.input):
-        print(f"Input file {args.input} not found. You can create one with --generate")
+    inputs = expand_inputs(args.input)
+    missing = [path for path in inputs if not os.path.exists(path)]
+    for path in missing:
+        print(f"Input file {path} not found. You can create one with --generate")
+    inputs = [path for path in inputs if path not in missing]
+    if not inputs:
         return
 
-    cap, val, wt = read_input(args.input)
     impls = load_implementations(base_dir)
     if not impls:
-        print("No valid implementations were loaded. Ensure 1.py..4.py exist in the same directory and expose `knapsack(W, val, wt)`.")
+        print("No valid implementations were loaded. Ensure the files in IMPLEMENTATIONS exist in the same directory and expose `knapsack(W, val, wt)`.")
         return
 
-    print(f"Loaded {len(impls)} implementations. Items={len(val)} Capacity={cap}")
-    results = benchmark(impls, cap, val, wt, timeout=args.timeout)
+    timing = {'warmup': args.warmup, 'min_reps': args.min_reps, 'max_reps': args.max_reps,
+              'target_error': args.target_error, 'time_budget': args.time_budget}
+    cache = None
+    if args.cache or args.cache_db:
+        cache = (args.cache_size * 1024 * 1024, args.cache_db)
+    tasks = []
+    for path in inputs:
+        cap, val, wt = read_input(path)
+        print(f"{os.path.basename(path)}: Items={len(val)} Capacity={cap}")
+        tasks += make_tasks(impls, cap, val, wt, input_name=os.path.basename(path), reduce=args.reduce, timing=timing,
+                            memory_limit_mb=args.memory_limit, count_ops=args.count_ops, cache=cache)
+
+    print(f"Loaded {len(impls)} implementations; {len(tasks)} run(s) on {args.jobs or os.cpu_count()} worker(s)")
+    results = run_tasks(tasks, timeout=args.timeout, jobs=args.jobs)
     save_results_csv(args.output, results)
 
 
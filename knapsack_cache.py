@@ -0,0 +1,187 @@
+"""
+Content-addressed result cache for the knapsack solvers.
+
+Results are keyed by a canonical hash of the instance: the items are sorted
+by (weight, value) before hashing, so the same multiset of items submitted
+in any order maps to the same entry. Chosen items are stored as positions in
+the canonical order and mapped back to the caller's indices on every hit.
+The key also covers the solver (source file and function name) and its
+keyword arguments, because approximate solvers give different answers.
+
+`ResultCache` has two tiers:
+
+- memory: an LRU (OrderedDict) bounded by an estimated size in bytes;
+- disk (optional): an sqlite database shared by every process that opens
+  the same path, consulted on a memory miss and written on every solve.
+
+Any solver opts in with `with_cache(solver, cache)` (or `cache.wrap`), which
+keeps the `knapsack(W, val, wt)` signature; `hits`, `disk_hits` and `misses`
+count the lookups.
+"""
+import os
+import struct
+import sqlite3
+import hashlib
+from array import array
+from collections import OrderedDict
+
+# Rough per-entry overhead of the LRU (key, tuple, list, dict slot) in bytes
+_ENTRY_OVERHEAD = 200
+
+
+def canonical_order(val, wt):
+    """Indices sorted by (weight, value, index): position k holds item order[k]."""
+    return sorted(range(len(val)), key=lambda i: (wt[i], val[i], i))
+
+
+def _pack(xs):
+    try:
+        return array('q', xs).tobytes()
+    except OverflowError:
+        # values beyond int64 fall back to a textual encoding
+        return ','.join(map(str, xs)).encode()
+
+
+def instance_key(W, val, wt, namespace='', order=None):
+    """Hex digest identifying (namespace, W, multiset of items)."""
+    if order is None:
+        order = canonical_order(val, wt)
+    h = hashlib.sha256()
+    h.update(namespace.encode())
+    h.update(struct.pack('<q', len(order)))
+    h.update(str(int(W)).encode() + b'|')
+    h.update(_pack([int(wt[i]) for i in order]))
+    h.update(_pack([int(val[i]) for i in order]))
+    return h.hexdigest()
+
+
+def _namespace(solver, kwargs, name=None):
+    # `name`, or the source file and name of the solver and of every solver
+    # it wraps, followed by the keyword arguments
+    parts = [name] if name else []
+    while solver is not None and not name:
+        code = getattr(solver, '__code__', None)
+        source = os.path.basename(code.co_filename) if code is not None else getattr(solver, '__module__', '')
+        parts.append(f"{source}:{getattr(solver, '__qualname__', getattr(solver, '__name__', 'solver'))}")
+        solver = getattr(solver, '__wrapped__', None)
+    args = ','.join(f"{k}={kwargs[k]!r}" for k in sorted(kwargs))
+    return f"{'>'.join(parts)}({args})"
+
+
+class ResultCache:
+    """
+    Two-tier cache of solver results.
+
+    max_bytes: memory budget of the LRU tier (estimated entry sizes)
+    path:      sqlite file for the disk tier; None keeps the cache in memory only
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, chosen, size)
+        self._bytes = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30)
+            self._db.execute('CREATE TABLE IF NOT EXISTS results '
+                             '(key TEXT PRIMARY KEY, value TEXT NOT NULL, chosen BLOB)')
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {'cache_hits': self.hits, 'cache_disk_hits': self.disk_hits, 'cache_misses': self.misses}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key, value, chosen):
+        size = _ENTRY_OVERHEAD + len(key) + (8 * len(chosen) if chosen is not None else 0)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._entries[key] = (value, chosen, size)
+        self._bytes += size
+        # Evict least recently used entries until the budget holds again
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def get(self, key):
+        """Returns (value, canonical_chosen) or None; updates the counters."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+        if self._db is not None:
+            row = self._db.execute('SELECT value, chosen FROM results WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                value = int(row[0])
+                chosen = None if row[1] is None else array('q', row[1]).tolist()
+                self._remember(key, value, chosen)
+                self.disk_hits += 1
+                return value, chosen
+        self.misses += 1
+        return None
+
+    def put(self, key, value, chosen=None):
+        """Stores a result; `chosen` holds canonical positions (or None)."""
+        self._remember(key, value, chosen)
+        if self._db is not None:
+            blob = None if chosen is None else array('q', chosen).tobytes()
+            self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)', (key, str(value), blob))
+            self._db.commit()
+
+    def solve(self, solver, W, val, wt, namespace=None, **kwargs):
+        """
+        Returns `solver(W, val, wt, **kwargs)`, from the cache when possible.
+        Solvers returning (value, chosen) get chosen in the caller's indices.
+        A `counter` keyword is passed through but not part of the key.
+        """
+        keyed = {k: v for k, v in kwargs.items() if k != 'counter'}
+        order = canonical_order(val, wt)
+        key = instance_key(W, val, wt, _namespace(solver, keyed, namespace), order)
+
+        found = self.get(key)
+        if found is None:
+            res = solver(W, val, wt, **kwargs)
+            if isinstance(res, tuple) and res[1] is None:
+                # no items to remap; keep the entry out so hits stay tuples
+                return res
+            if isinstance(res, tuple):
+                position = [0] * len(order)
+                for k, i in enumerate(order):
+                    position[i] = k
+                self.put(key, res[0], sorted(position[i] for i in res[1]))
+            else:
+                self.put(key, res)
+            return res
+
+        value, chosen = found
+        if chosen is None:
+            return value
+        return value, sorted(order[k] for k in chosen)
+
+    def wrap(self, solver, namespace=None):
+        """Wraps `solver` so that every call goes through `solve`."""
+        def cached_solver(W, val, wt, **kwargs):
+            return self.solve(solver, W, val, wt, namespace=namespace, **kwargs)
+        cached_solver.__name__ = getattr(solver, '__name__', 'solver')
+        cached_solver.__doc__ = getattr(solver, '__doc__', None)
+        cached_solver.__wrapped__ = solver
+        return cached_solver
+
+
+def with_cache(solver, cache=None, namespace=None):
+    """Wraps `solver` with `cache` (a fresh in-memory ResultCache by default)."""
+    return (cache if cache is not None else ResultCache()).wrap(solver, namespace)
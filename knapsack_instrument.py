@@ -0,0 +1,69 @@
+"""
+Per-run instrumentation for the knapsack solvers.
+
+Every solver accepts an optional `counter` keyword. When it is None (the
+default) the hot loops carry no counting code at all; when an `OpCounter`
+is passed, each solver adds its operation count in bulk (once per item row
+or per merge pass) or computes it analytically, so counted runs stay close
+to uncounted ones.
+
+`run(solver, W, val, wt, count=True)` calls a solver and returns a
+`RunResult` with the value, the chosen items (when the solver returns
+them), the operation count and the elapsed time. Counts live in the
+counter of each call instead of module globals, so concurrent runs in
+threads do not interfere.
+"""
+import time
+
+
+class OpCounter:
+    """Accumulates the operation count of one run (`ops`)."""
+
+    __slots__ = ('ops',)
+
+    def __init__(self):
+        self.ops = 0
+
+    def add(self, n=1):
+        self.ops += n
+
+
+class RunResult:
+    """
+    Result of `run`.
+
+    value:  optimal (or approximate) value returned by the solver
+    chosen: chosen item indices, or None when the solver returns only the value
+    ops:    operation count, or None when the run was not counted
+    time:   wall-clock seconds spent in the solver call
+    """
+
+    def __init__(self, value, chosen, ops, time):
+        self.value = value
+        self.chosen = chosen
+        self.ops = ops
+        self.time = time
+
+    def __repr__(self):
+        return (f"RunResult(value={self.value!r}, chosen={self.chosen!r}, "
+                f"ops={self.ops!r}, time={self.time!r})")
+
+
+def run(solver, W, val, wt, count=True, **kwargs):
+    """
+    Calls `solver(W, val, wt, **kwargs)` (plus `counter=` when `count` is true)
+    and returns a `RunResult`. Solvers returning (value, chosen) have both
+    fields filled; solvers returning an int leave `chosen` as None.
+    """
+    counter = OpCounter() if count else None
+    if counter is not None:
+        kwargs['counter'] = counter
+    t0 = time.perf_counter()
+    result = solver(W, val, wt, **kwargs)
+    elapsed = time.perf_counter() - t0
+
+    if isinstance(result, tuple):
+        value, chosen = result
+    else:
+        value, chosen = result, None
+    return RunResult(value, chosen, counter.ops if counter is not None else None, elapsed)
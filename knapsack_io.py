@@ -0,0 +1,386 @@
+"""
+Instance readers and writers that scale to very large inputs.
+
+Two on-disk formats are supported:
+
+- JSON, `{"capacity": int, "items": [{"w": int, "v": int}, ...]}` (the
+  format of the input_*.json files). `read_json` parses it incrementally,
+  a chunk at a time, straight into typed `array('q')` columns, so no dict
+  per item is ever built. `write_json` streams items to disk. An item may
+  carry a count of identical copies, `{"w": int, "v": int, "c": int}`
+  (bounded knapsack): `read_json(..., counts=True)` returns the counts as a
+  fourth column; otherwise each item is expanded into `c` 0/1 items, so
+  every solver can read bounded instances.
+- Binary: a 24-byte header (magic b'KNAP', uint32 version, int64 capacity,
+  int64 n) followed by two little-endian int64 columns, all n weights and
+  then all n values. `read_binary(path, backend='numpy')` maps the columns
+  with `np.memmap` without copying.
+
+`read_instance` detects the format from the file contents and returns
+`(capacity, val, wt)` (plus `cnt` with counts=True); `convert(src, dst)`
+rewrites an instance in the format given by the extension of `dst` ('.bin'
+for binary, JSON otherwise). The binary format has no count column, so
+counts are expanded into copies when converting to it.
+
+Usage:
+  python knapsack_io.py input_32.json input_32.bin
+"""
+import os
+import sys
+import json
+import struct
+import argparse
+from array import array
+
+MAGIC = b'KNAP'
+VERSION = 1
+# magic, version, capacity, n
+_HEADER = struct.Struct('<4sIqq')
+BINARY_SUFFIXES = ('.bin',)
+
+_CHUNK = 1 << 20
+_WS = ' \t\r\n'
+_DECODER = json.JSONDecoder()
+# Punctuation blanked out by the fast path, leaving only keys and numbers
+_BLANK = str.maketrans('{}:,"', '     ')
+
+
+def is_binary_path(path):
+    return os.path.splitext(path)[1].lower() in BINARY_SUFFIXES
+
+
+class _Stream:
+    """Character buffer over a text file, refilled one chunk at a time."""
+
+    def __init__(self, f, chunk_size=_CHUNK):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        # Drops the consumed prefix and appends the next chunk; False at EOF
+        data = self.f.read(self.chunk_size)
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        if not data:
+            self.eof = True
+        return bool(data)
+
+    def peek(self):
+        # Next non-whitespace character without consuming it ('' at EOF)
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, ch):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"expected {ch!r} in JSON instance, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        # One complete JSON value; a value that touches the end of the buffer
+        # may be truncated (e.g. a number), so it is re-read with more input
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+class _Columns:
+    """Typed item columns; the count column only exists once a count is read."""
+
+    def __init__(self):
+        self.wt = array('q')
+        self.val = array('q')
+        self.cnt = None
+
+    def counts(self):
+        # Items read before the first count had one copy each
+        if self.cnt is None:
+            self.cnt = array('q', [1]) * len(self.wt)
+        return self.cnt
+
+
+def _fast_items(stream, cols):
+    """
+    Parses every complete item left in the buffer at once when they all have
+    the shape {"w": int, "v": int} or {"w": int, "v": int, "c": int}: the
+    punctuation is blanked out and the remaining tokens are split in C.
+    Returns False (consuming nothing) when the items have any other shape.
+    """
+    buf, pos = stream.buf, stream.pos
+    stop = buf.find(']', pos)
+    end = buf.rfind('}', pos, len(buf) if stop < 0 else stop) + 1
+    if end <= pos:
+        return True
+    region = buf[pos:end]
+    n = region.count('{')
+    tokens = region.translate(_BLANK).split()
+    # 2 tokens per key: w, v and optionally c, in this order
+    keys = len(tokens) // (2 * n) if n else 0
+    if (keys not in (2, 3) or region.count('}') != n or region.count(':') != keys * n
+            or region.count(',') != keys * n - 1 or len(tokens) != 2 * keys * n
+            or tokens[0::2 * keys].count('w') != n or tokens[2::2 * keys].count('v') != n
+            or (keys == 3 and tokens[4::6].count('c') != n)):
+        return False
+    try:
+        ws = array('q', map(int, tokens[1::2 * keys]))
+        vs = array('q', map(int, tokens[3::2 * keys]))
+        cs = array('q', map(int, tokens[5::6])) if keys == 3 else None
+    except ValueError:
+        # e.g. floats or exponents: leave them to the JSON decoder
+        return False
+    if cs is not None and min(cs) < 0:
+        raise ValueError('item counts must be non-negative')
+    if cs is not None:
+        cols.counts().extend(cs)
+    elif cols.cnt is not None:
+        cols.cnt.extend(array('q', [1]) * n)
+    cols.wt.extend(ws)
+    cols.val.extend(vs)
+    stream.pos = end
+    return True
+
+
+def _read_items(stream, cols):
+    stream.expect('[')
+    if stream.peek() == ']':
+        stream.pos += 1
+        return
+    fast = True
+    while True:
+        start = stream.pos
+        if fast:
+            fast = _fast_items(stream, cols)
+        if stream.pos == start:
+            # Item split across chunks, or not in the common shape
+            item = stream.value()
+            if not isinstance(item, dict):
+                raise ValueError(f"item must be an object, found {item!r}")
+            c = int(item.get('c', 1))
+            if c < 0:
+                raise ValueError('item counts must be non-negative')
+            if c != 1 or cols.cnt is not None:
+                cols.counts().append(c)
+            cols.wt.append(int(item['w']))
+            cols.val.append(int(item['v']))
+
+        sep = stream.peek()
+        stream.pos += 1
+        if sep == ']':
+            return
+        if sep != ',':
+            raise ValueError(f"expected ',' or ']' in the items array, found {sep!r}")
+
+
+def _to_backend(backend, *cols):
+    if backend == 'array':
+        return cols
+    if backend == 'list':
+        return tuple(col.tolist() for col in cols)
+    if backend == 'numpy':
+        import numpy as np
+        # array('q') exposes the buffer protocol: no copy
+        return tuple(np.frombuffer(col, dtype=np.int64) for col in cols)
+    raise ValueError(f"unknown backend: {backend!r}")
+
+
+def expand_counts(val, wt, cnt):
+    """0/1 columns (array('q')) with item i repeated cnt[i] times."""
+    ev, ew = array('q'), array('q')
+    for v, w, c in zip(val, wt, cnt):
+        if c == 1:
+            ev.append(v)
+            ew.append(w)
+        elif c:
+            ev.extend(array('q', [v]) * c)
+            ew.extend(array('q', [w]) * c)
+    return ev, ew
+
+
+def read_json(path, backend='array', chunk_size=_CHUNK, counts=False):
+    """
+    Streams a JSON instance into typed columns and returns (capacity, val, wt),
+    or (capacity, val, wt, cnt) with `counts`. Without `counts`, items with a
+    count "c" are expanded into c copies. `backend` is 'array' (array('q')),
+    'numpy' (int64 arrays over the same buffers) or 'list'.
+    """
+    cap = 0
+    cols = _Columns()
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _Stream(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return _result(cap, cols, backend, counts)
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key == 'items':
+                _read_items(stream, cols)
+            else:
+                value = stream.value()
+                if key == 'capacity':
+                    cap = int(value)
+            sep = stream.peek()
+            stream.pos += 1
+            if sep == '}':
+                break
+            if sep != ',':
+                raise ValueError(f"expected ',' or '}}' in JSON instance, found {sep!r}")
+    return _result(cap, cols, backend, counts)
+
+
+def _result(cap, cols, backend, counts):
+    if counts:
+        return cap, *_to_backend(backend, cols.val, cols.wt, cols.counts())
+    if cols.cnt is not None:
+        return cap, *_to_backend(backend, *expand_counts(cols.val, cols.wt, cols.cnt))
+    return cap, *_to_backend(backend, cols.val, cols.wt)
+
+
+def read_binary(path, backend='numpy', counts=False):
+    """
+    Reads a binary instance and returns (capacity, val, wt) (plus a column of
+    ones with `counts`). With backend='numpy' both columns are read-only views
+    of one `np.memmap` (nothing is copied into memory); 'array' and 'list'
+    read the columns.
+    """
+    with open(path, 'rb') as f:
+        magic, version, cap, n = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary knapsack instance")
+        if version != VERSION:
+            raise ValueError(f"unsupported binary instance version {version}")
+        if backend == 'numpy':
+            import numpy as np
+            ones = (np.ones(n, dtype=np.int64),) if counts else ()
+            if n == 0:
+                # mmap cannot map an empty region
+                return cap, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), *ones
+            cols = np.memmap(path, dtype='<i8', mode='r', offset=_HEADER.size, shape=(2, n))
+            return cap, cols[1], cols[0], *ones
+        wt, val = array('q'), array('q')
+        wt.fromfile(f, n)
+        val.fromfile(f, n)
+    if sys.byteorder == 'big':
+        wt.byteswap()
+        val.byteswap()
+    if counts:
+        return cap, *_to_backend(backend, val, wt, array('q', [1]) * n)
+    return cap, *_to_backend(backend, val, wt)
+
+
+def read_instance(path, backend='array', counts=False):
+    """
+    Reads a JSON or binary instance (detected from the header) as
+    (capacity, val, wt), or (capacity, val, wt, cnt) with `counts`.
+    """
+    with open(path, 'rb') as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+    if binary:
+        return read_binary(path, backend, counts)
+    return read_json(path, backend, counts=counts)
+
+
+def write_json(path, capacity, items):
+    """
+    Writes an instance as JSON, one item per line; `items` yields (w, v) or
+    (w, v, c) tuples ("c" is only written when it is not 1).
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'{{\n  "capacity": {int(capacity)},\n  "items": [')
+        sep = '\n'
+        for item in items:
+            w, v = item[0], item[1]
+            c = int(item[2]) if len(item) > 2 else 1
+            count = f', "c": {c}' if c != 1 else ''
+            f.write(f'{sep}    {{ "w": {int(w)}, "v": {int(v)}{count} }}')
+            sep = ',\n'
+        f.write('\n  ]\n}\n')
+
+
+def _column(xs):
+    if isinstance(xs, array) and xs.typecode == 'q':
+        col = xs
+    elif hasattr(xs, 'astype'):
+        # numpy array: a contiguous little-endian copy is written as is
+        return xs.astype('<i8').tobytes()
+    else:
+        col = array('q', xs)
+    if sys.byteorder == 'big':
+        col = array('q', col)
+        col.byteswap()
+    return col
+
+
+def write_binary(path, capacity, wt, val):
+    """Writes the header and the weight and value columns (int64, little endian)."""
+    if len(wt) != len(val):
+        raise ValueError('weights and values must have the same length')
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, int(capacity), len(wt)))
+        for xs in (wt, val):
+            col = _column(xs)
+            if isinstance(col, bytes):
+                f.write(col)
+            else:
+                col.tofile(f)
+
+
+def write_instance(path, capacity, items):
+    """
+    Writes (w, v) or (w, v, c) tuples from the iterable `items` in the format
+    given by the extension of `path`. JSON is streamed; binary collects typed
+    columns first because the weights precede the values on disk, and
+    expands counts into copies.
+    """
+    if not is_binary_path(path):
+        write_json(path, capacity, items)
+        return
+    wt, val = array('q'), array('q')
+    for item in items:
+        c = item[2] if len(item) > 2 else 1
+        for _ in range(c):
+            wt.append(item[0])
+            val.append(item[1])
+    write_binary(path, capacity, wt, val)
+
+
+def convert(src, dst):
+    """Rewrites the instance `src` as `dst` (format from the extension of dst)."""
+    if is_binary_path(dst):
+        cap, val, wt = read_instance(src, backend='array')
+        write_binary(dst, cap, wt, val)
+    else:
+        cap, val, wt, cnt = read_instance(src, backend='array', counts=True)
+        write_json(dst, cap, zip(wt, val, cnt))
+    return cap, len(val)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Convert knapsack instances between JSON and binary')
+    p.add_argument('src', help='Input instance (JSON or binary)')
+    p.add_argument('dst', help="Output path; '.bin' writes binary, anything else JSON")
+    args = p.parse_args()
+    cap, n = convert(args.src, args.dst)
+    print(f"Wrote {args.dst} (n={n}, capacity={cap})")
+
+
+if __name__ == '__main__':
+    main()
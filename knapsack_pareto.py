@@ -0,0 +1,69 @@
+"""
+Pareto-frontier merge shared by the sparse knapsack solvers.
+
+A frontier is a set of non-dominated (weight, value) states kept as parallel
+lists ordered by increasing weight with strictly increasing values. Adding
+an item merges the frontier with a copy of itself shifted by the item's
+(weight, value) in linear time, dropping dominated states. Used by
+5_meet_in_middle.py (each half), 9_core.py (the core states, with negative
+shifts for removed items) and 10_pd_esparsa.py, so the three apply the same
+pruning rules.
+
+Each state may carry a decision: a linked list (item, previous) of the items
+applied on the way to it, rebuilt with `items(d)`.
+"""
+
+
+def merge(ws, vs, ds, dw, dv, item, W=None):
+    """
+    Merges the frontier (ws, vs) with its copy shifted by (dw, dv) and
+    returns the new (ws, vs, ds). Shifted states record `item` on top of
+    their decision; with `ds` None no decisions are tracked and the returned
+    ds is None. With a capacity `W`, shifted states heavier than W are
+    dropped (states of the frontier itself are always kept).
+    """
+    m = len(ws)
+    track = ds is not None
+    cap = W is not None
+    nws, nvs = [], []
+    nds = [] if track else None
+    a = b = 0
+    while a < m or b < m:
+        # Next state in weight order between the frontier and the shifted copy
+        if b >= m or (a < m and ws[a] <= ws[b] + dw):
+            w, v = ws[a], vs[a]
+            d = ds[a] if track else None
+            a += 1
+        else:
+            w = ws[b] + dw
+            if cap and w > W:
+                # the rest of the shifted copy is heavier as well
+                b = m
+                continue
+            v = vs[b] + dv
+            d = (item, ds[b]) if track else None
+            b += 1
+        # Dominance: keep the state only if it improves the value
+        if nvs and v <= nvs[-1]:
+            continue
+        if nws and w == nws[-1]:
+            # same weight with a larger value: replaces the previous state
+            nvs[-1] = v
+            if track:
+                nds[-1] = d
+            continue
+        nws.append(w)
+        nvs.append(v)
+        if track:
+            nds.append(d)
+    return nws, nvs, nds
+
+
+def items(d):
+    """Items of decision `d`, in the order they were applied."""
+    out = []
+    while d is not None:
+        out.append(d[0])
+        d = d[1]
+    out.reverse()
+    return out
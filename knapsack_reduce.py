@@ -0,0 +1,143 @@
+"""
+Shared preprocessing (reduction) pass for the knapsack solvers.
+
+`reduce_instance(W, val, wt)` returns a smaller, equivalent instance plus the
+information needed to map a solution back to the original indices:
+
+- items heavier than W, or with no value, are dropped;
+- zero-weight items with positive value are always taken (fixed in);
+- items are fixed in/out with the Dembo–Hammer reduction bounds: if forcing
+  an item out (in) makes the LP upper bound fall to the greedy lower bound or
+  below, no better solution leaves it out (puts it in);
+- weights and capacity are divided by the GCD of the remaining weights.
+
+Any solver opts in through `solve_reduced(solver, W, val, wt)` or by wrapping
+itself with `with_reduction(solver)`; both keep the `knapsack(W, val, wt)`
+signature and return `(value, chosen_indices)` in original indices when the
+solver does.
+"""
+import math
+
+import knapsack_registry
+
+
+class ReducedInstance:
+    """
+    Result of `reduce_instance`.
+
+    W, val, wt: the reduced instance (weights and capacity divided by `scale`)
+    index:      index[k] is the original index of reduced item k
+    fixed:      original indices that belong to every solution of interest
+    offset:     total value of the fixed items
+    incumbent:  (value, chosen) lower-bound solution in original indices; it is
+                returned instead when the reduced optimum does not beat it
+    """
+
+    def __init__(self, W, val, wt, index, fixed, offset, incumbent, scale):
+        self.W = W
+        self.val = val
+        self.wt = wt
+        self.index = index
+        self.fixed = fixed
+        self.offset = offset
+        self.incumbent = incumbent
+        self.scale = scale
+
+    def restore(self, value, chosen=None):
+        """Maps a reduced solution back; returns (value, chosen_indices)."""
+        total = self.offset + value
+        if total < self.incumbent[0]:
+            return self.incumbent[0], sorted(self.incumbent[1])
+        if chosen is None:
+            return total, None
+        return total, sorted(self.fixed + [self.index[k] for k in chosen])
+
+
+def reduce_instance(W, val, wt, use_bounds=True):
+    """Builds a `ReducedInstance`; `use_bounds=False` skips the bound fixing."""
+    keep = [i for i in range(len(val)) if wt[i] <= W and val[i] > 0]
+    fixed = [i for i in keep if wt[i] == 0]
+    keep = [i for i in keep if wt[i] > 0]
+    offset = sum(val[i] for i in fixed)
+    capacity = W
+    incumbent = (offset, list(fixed))
+
+    if use_bounds and keep:
+        greed = knapsack_registry.load('greedy')
+        sub_val = [val[i] for i in keep]
+        sub_wt = [wt[i] for i in keep]
+        lower, lower_items = greed.knapsack_with_items(capacity, sub_val, sub_wt, mode='critical')
+        incumbent = (offset + lower, fixed + [keep[k] for k in lower_items])
+
+        above, remaining, critical = greed.critical_split(capacity, sub_val, sub_wt)
+        if critical is None:
+            # everything fits: the greedy solution takes all items
+            fixed += keep
+            offset += sum(sub_val)
+            capacity -= sum(sub_wt)
+            keep = []
+        else:
+            # Bounds are compared multiplied by the critical item's weight so
+            # that the fractional LP value stays an exact integer
+            vb, wb = sub_val[critical], sub_wt[critical]
+            lp = wb * sum(sub_val[k] for k in above) + remaining * vb
+            target = wb * (lower + 1)
+            in_lp = set(above)
+            fix_in, still_free = [], []
+            for k in range(len(keep)):
+                if k in in_lp:
+                    # upper bound with the item forced out
+                    if lp - wb * sub_val[k] + sub_wt[k] * vb < target:
+                        fix_in.append(k)
+                        continue
+                elif lp + wb * sub_val[k] - sub_wt[k] * vb < target:
+                    # forcing the item in cannot beat the lower bound: drop it
+                    continue
+                still_free.append(k)
+            fixed += [keep[k] for k in fix_in]
+            offset += sum(sub_val[k] for k in fix_in)
+            capacity -= sum(sub_wt[k] for k in fix_in)
+            keep = [keep[k] for k in still_free if sub_wt[k] <= capacity]
+
+    if capacity < 0:
+        # the fixed items alone overflow: only the incumbent is valid
+        return ReducedInstance(0, [], [], [], [], 0, incumbent, 1)
+
+    scale = 0
+    for i in keep:
+        scale = math.gcd(scale, wt[i])
+    scale = scale or 1
+
+    return ReducedInstance(
+        capacity // scale,
+        [val[i] for i in keep],
+        [wt[i] // scale for i in keep],
+        keep,
+        fixed,
+        offset,
+        incumbent,
+        scale,
+    )
+
+
+def solve_reduced(solver, W, val, wt, use_bounds=True, **kwargs):
+    """
+    Reduces the instance, calls `solver(W, val, wt, **kwargs)` on it and maps
+    the answer back. Solvers returning an int get an int back; solvers
+    returning (value, chosen) get (value, chosen) in original indices.
+    """
+    red = reduce_instance(W, val, wt, use_bounds=use_bounds)
+    res = solver(red.W, red.val, red.wt, **kwargs)
+    if isinstance(res, tuple):
+        return red.restore(res[0], res[1])
+    return red.restore(res)[0]
+
+
+def with_reduction(solver, use_bounds=True):
+    """Wraps `solver` so that every call goes through `solve_reduced`."""
+    def reduced_solver(W, val, wt, **kwargs):
+        return solve_reduced(solver, W, val, wt, use_bounds=use_bounds, **kwargs)
+    reduced_solver.__name__ = getattr(solver, '__name__', 'solver')
+    reduced_solver.__doc__ = getattr(solver, '__doc__', None)
+    reduced_solver.__wrapped__ = solver
+    return reduced_solver
@@ -0,0 +1,186 @@
+"""
+Registry of the knapsack solvers.
+
+Each entry (`SolverSpec`) records the solver's name, implementation file,
+keyword arguments, capabilities (whether it can return the chosen items,
+whether it is exact or approximate) and complexity class. Benchmark, batch
+and command-line runners all look solvers up here instead of keeping their
+own tables of file paths.
+
+Modules are imported lazily, by path (the filenames start with digits), the
+first time a solver is used, and stay loaded for the life of the process, so
+a long-lived process pays each import once. Solvers that call other solvers
+(7_pd_auto, 8_fptas, 9_core, knapsack_reduce, ...) load them through the
+registry as well, so every file is executed once per process. The seconds
+spent importing each module are kept (`load_time`), which lets the
+benchmark report startup cost separately from solve time.
+
+  import knapsack_registry as kr
+  kr.function('core', with_items=True)(W, val, wt)  # -> (value, chosen)
+  [s.name for s in kr.specs(exact=True, items=True)]
+"""
+import os
+import time
+import importlib.util
+
+_BASE = os.path.dirname(os.path.abspath(__file__))
+# path -> module, and path -> seconds spent importing it
+_MODULES = {}
+_LOAD_TIMES = {}
+
+
+def load_path(path, name=None):
+    """Imports the module at `path` once per process and returns it."""
+    path = os.path.abspath(path)
+    if path not in _MODULES:
+        t0 = time.perf_counter()
+        spec = importlib.util.spec_from_file_location(name or os.path.basename(path)[:-3], path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _LOAD_TIMES[path] = time.perf_counter() - t0
+        _MODULES[path] = module
+    return _MODULES[path]
+
+
+class SolverSpec:
+    """
+    One registered solver.
+
+    name:       registry key
+    filename:   implementation file, relative to the project root
+    impl:       benchmark label (impl_N), or None when it is not benchmarked
+    items:      True when `knapsack_with_items` can return the chosen items
+    exact:      True for optimal solvers, False for approximations
+    complexity: time complexity class, as documented in the module
+    kwargs:     keyword arguments passed on every call
+    value_entry: function returning only the value; None derives the value
+                from `knapsack_with_items`
+    """
+
+    def __init__(self, name, filename, impl=None, items=True, exact=True, complexity='', kwargs=None,
+                 value_entry='knapsack'):
+        self.name = name
+        self.filename = filename
+        self.impl = impl
+        self.items = items
+        self.exact = exact
+        self.complexity = complexity
+        self.kwargs = dict(kwargs or {})
+        self.value_entry = value_entry
+
+    def __repr__(self):
+        return (f"SolverSpec({self.name!r}, {self.filename!r}, items={self.items}, exact={self.exact}, "
+                f"complexity={self.complexity!r})")
+
+    def path(self, base_dir=None):
+        return os.path.join(base_dir or _BASE, self.filename)
+
+    def load(self, base_dir=None):
+        return load_path(self.path(base_dir), self.impl or self.name)
+
+    def load_time(self, base_dir=None):
+        """Seconds spent importing the module, or None while it is not loaded."""
+        return _LOAD_TIMES.get(os.path.abspath(self.path(base_dir)))
+
+    def function(self, with_items=False, base_dir=None):
+        """
+        The solver as `f(W, val, wt, **kwargs)` with the registered keyword
+        arguments applied; returns (value, chosen) when `with_items` is true.
+        """
+        if with_items and not self.items:
+            raise ValueError(f"solver {self.name!r} returns only the value")
+        mod = self.load(base_dir)
+        if with_items or self.value_entry is None:
+            fn = mod.knapsack_with_items
+        else:
+            fn = getattr(mod, self.value_entry)
+        fixed = self.kwargs
+        value_only = not with_items and self.value_entry is None
+        if not fixed and not value_only:
+            return fn
+
+        def solver(W, val, wt, **kwargs):
+            res = fn(W, val, wt, **fixed, **kwargs)
+            return res[0] if value_only else res
+        # Distinct names keep result-cache keys apart (see knapsack_cache)
+        solver.__name__ = solver.__qualname__ = self.name
+        solver.__doc__ = fn.__doc__
+        solver.__wrapped__ = fn
+        return solver
+
+    def lazy(self, with_items=False, base_dir=None):
+        """Like `function`, but the module is only imported on the first call."""
+        resolved = []
+
+        def solver(W, val, wt, **kwargs):
+            if not resolved:
+                resolved.append(self.function(with_items, base_dir))
+            return resolved[0](W, val, wt, **kwargs)
+        solver.__name__ = solver.__qualname__ = self.name
+        return solver
+
+
+SOLVERS = [
+    SolverSpec('brute_force', '1_brutalF.py', impl='impl_1', items=False, complexity='O(2^n)'),
+    SolverSpec('dp', '2_pd.py', impl='impl_2', items=False, complexity='O(n x W)'),
+    SolverSpec('greedy', '3_greed.py', impl='impl_3', exact=False, complexity='O(n log n)'),
+    SolverSpec('table_dp', '4_pd_com_itens.py', impl='impl_4', complexity='O(n x W)'),
+    SolverSpec('hirschberg_dp', '4_pd_com_itens.py', complexity='O(n x W)', kwargs={'mode': 'hirschberg'},
+               value_entry=None),
+    SolverSpec('meet_in_middle', '5_meet_in_middle.py', impl='impl_5', complexity='O(n x 2^(n/2))'),
+    SolverSpec('value_dp', '6_pd_valor.py', impl='impl_6', complexity='O(n x sum(v))'),
+    SolverSpec('auto_dp', '7_pd_auto.py', impl='impl_7', complexity='O(n x min(W, sum(v)))'),
+    SolverSpec('fptas', '8_fptas.py', impl='impl_8', exact=False, complexity='O(n log n + n / eps^2)'),
+    SolverSpec('core', '9_core.py', impl='impl_9', complexity='O(n) expected, O(n x W) worst case'),
+    SolverSpec('sparse_dp', '10_pd_esparsa.py', impl='impl_10', complexity='O(n x min(W, 2^n))'),
+    SolverSpec('incremental', '11_incremental.py', impl='impl_11', complexity='O(n x W)'),
+    SolverSpec('parallel_dp', '12_pd_paralela.py', impl='impl_12', items=False, complexity='O(n x W / p)'),
+    SolverSpec('batch_dp', '13_pd_lote.py', complexity='O(n x W), vectorized across instances'),
+    SolverSpec('bounded_dp', '14_mochila_limitada.py', complexity='O(n x W), n distinct items with counts'),
+    SolverSpec('anytime', '15_anytime.py', complexity='O(n) greedy, then core rounds until optimal or time_limit'),
+]
+REGISTRY = {spec.name: spec for spec in SOLVERS}
+
+
+def get(name):
+    """The spec registered as `name` (or as benchmark label `name`, e.g. 'impl_4')."""
+    if name in REGISTRY:
+        return REGISTRY[name]
+    for spec in SOLVERS:
+        if spec.impl == name:
+            return spec
+    raise KeyError(f"unknown solver {name!r}; choose from {names()}")
+
+
+def names(**filters):
+    return [spec.name for spec in specs(**filters)]
+
+
+def specs(exact=None, items=None, benchmarked=None):
+    """Registered solvers in benchmark order, filtered by capability."""
+    return [spec for spec in SOLVERS
+            if (exact is None or spec.exact == exact) and (items is None or spec.items == items)
+            and (benchmarked is None or (spec.impl is not None) == benchmarked)]
+
+
+def function(name, with_items=False):
+    return get(name).function(with_items)
+
+
+def load(name):
+    return get(name).load()
+
+
+def solve(name, W, val, wt, with_items=False, **kwargs):
+    return get(name).function(with_items)(W, val, wt, **kwargs)
+
+
+def load_times():
+    """Import time in seconds of every module loaded so far, by filename."""
+    return {os.path.basename(path): t for path, t in _LOAD_TIMES.items()}
+
+
+if __name__ == '__main__':
+    for spec in SOLVERS:
+        kind = ('exact' if spec.exact else 'approx') + (', items' if spec.items else '')
+        print(f"{spec.name:15s} {spec.impl or '-':8s} {spec.filename:20s} {kind:14s} {spec.complexity}")
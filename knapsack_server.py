@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Local solve server for knapsack instances (asyncio).
+
+Keeps the solver modules loaded in a pool of worker processes and answers
+requests over a Unix socket or localhost TCP, so callers no longer pay an
+interpreter start and module imports per instance (as with run4.py).
+
+The protocol is newline-delimited JSON. Each request line is an instance in
+the batch_solve.py format, {"capacity": int, "items": [{"w", "v"[, "c"]}, ...]},
+optionally with an "id", a "solver" and, for "anytime", a "time_limit". Each
+reply line is the batch_solve.py output object (value, chosen, algo, time,
+...) plus:
+
+- "index": position of the request on its connection, "id" when given;
+- "latency": seconds from reading the request to writing the reply;
+- "coalesced": true when the answer was shared with an identical request
+  already in flight (same instance, item order, solver and options): only
+  one computation runs and every waiting request gets its result;
+- "downgraded": true when admission control solved it greedily instead.
+
+Requests on a connection may be pipelined; replies are written as they
+complete. The line {"op": "stats"} returns the server counters and the
+queue-depth and latency histograms instead of a solve.
+
+Admission control: the solver is chosen as in batch_solve.py, but without
+its cost cap, and its cost is predicted by batch_solve.predicted_cost
+(n x (W + 1) DP cells for the table solvers, n x 2^(n/2) for
+meet-in-the-middle). Above `max_cost` the request
+is either solved with the greedy 1/2-approximation (policy 'greedy') or
+rejected (policy 'reject'); with more than `max_pending` distinct
+computations in flight, new ones are rejected until the pool catches up.
+
+Usage:
+  python knapsack_server.py --unix /tmp/knapsack.sock
+  python knapsack_server.py --port 8765 --jobs 4 --max-cost 50000000 --policy reject
+
+  # Measure throughput and latency percentiles
+  python scripts/load_test.py --unix /tmp/knapsack.sock --requests 5000 --concurrency 32
+"""
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_solve
+import knapsack_cache
+
+# Predicted cost (DP cells or states) above which admission control applies
+MAX_COST = 50_000_000
+# Distinct computations in flight before new ones are rejected
+MAX_PENDING = 1024
+# Longest request line accepted (bytes)
+MAX_LINE = 64 * 1024 * 1024
+
+# Histogram bounds: latency in seconds (1-2-5 series from 0.1 ms to 60 s) and
+# queue depth (powers of two)
+LATENCY_BOUNDS = [m * 10.0 ** e for e in range(-4, 2) for m in (1, 2, 5)] + [60.0]
+DEPTH_BOUNDS = [0] + [1 << k for k in range(13)]
+
+
+class Histogram:
+    """
+    Bucketed counts of observations: bucket k counts the values up to
+    bounds[k] (and above bounds[k - 1]); the last bucket counts the values
+    beyond every bound. Percentiles are reported as bucket upper bounds.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+
+    def add(self, x):
+        self.counts[bisect_left(self.bounds, x)] += 1
+        self.count += 1
+        self.total += x
+        if self.max is None or x > self.max:
+            self.max = x
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-quantile (0 <= q <= 1)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for k, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                return self.bounds[k] if k < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'buckets': [[b, c] for b, c in zip(self.bounds + ['inf'], self.counts) if c],
+        }
+
+
+class Rejected(Exception):
+    """A request refused by admission control."""
+
+
+class SolveServer:
+    """
+    Solve service shared by every connection.
+
+    jobs:        worker processes (default: number of CPUs)
+    max_cost:    predicted cost above which `policy` applies (None: no limit)
+    policy:      'greedy' (solve with the greedy heuristic) or 'reject'
+    max_pending: distinct computations in flight before rejecting new ones
+    """
+
+    def __init__(self, jobs=None, max_cost=MAX_COST, policy='greedy', max_pending=MAX_PENDING):
+        if policy not in ('greedy', 'reject'):
+            raise ValueError(f"unknown admission policy {policy!r}")
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_cost = max_cost
+        self.policy = policy
+        self.max_pending = max_pending
+        self.counts = {'requests': 0, 'solved': 0, 'coalesced': 0, 'downgraded': 0, 'rejected': 0, 'errors': 0}
+        self.latency = Histogram(LATENCY_BOUNDS)
+        self.depth = Histogram(DEPTH_BOUNDS)
+        self.started = time.monotonic()
+        self._inflight = {}  # coalescing key -> future of (ok, output line)
+        self._pool = ProcessPoolExecutor(self.jobs, initializer=batch_solve.init_worker)
+        self._servers = []
+
+    def stats(self):
+        return {
+            **self.counts,
+            'in_flight': len(self._inflight),
+            'jobs': self.jobs,
+            'uptime': time.monotonic() - self.started,
+            'queue_depth': self.depth.snapshot(),
+            'request_latency': self.latency.snapshot(),
+        }
+
+    def _admit(self, req, instance):
+        # Returns (solver name, downgraded) or raises Rejected
+        W, val, wt, cnt = instance
+        # The exact choice, uncapped: above max_cost the policy applies instead
+        name = req.get('solver') or batch_solve.choose_solver(W, val, wt, cnt, max_cost=None)
+        if name not in batch_solve.SOLVERS:
+            raise ValueError(f"unknown solver {name!r}; choose from {sorted(batch_solve.SOLVERS)}")
+        cost = batch_solve.predicted_cost(name, W, len(val))
+        if self.max_cost is None or cost <= self.max_cost:
+            return name, False
+        if self.policy == 'reject':
+            raise Rejected(f"predicted cost {cost} of {name} exceeds the limit {self.max_cost}")
+        return 'greedy', True
+
+    async def solve(self, req):
+        """Solves one request (a parsed JSON object) and returns the output dict."""
+        W, val, wt, cnt = instance = batch_solve.parse_instance(req)
+        name, downgraded = self._admit(req, instance)
+        options = {'solver': name}
+        if name == 'anytime' and req.get('time_limit') is not None:
+            options['time_limit'] = req['time_limit']
+
+        # Identical instances (item order included, so chosen indices agree)
+        # with the same solver and options share one computation
+        namespace = json.dumps([options, cnt])
+        key = knapsack_cache.instance_key(W, val, wt, namespace, order=range(len(val)))
+        self.depth.add(len(self._inflight))
+        future = self._inflight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.counts['coalesced'] += 1
+        else:
+            if len(self._inflight) >= self.max_pending:
+                raise Rejected(f"server busy: {len(self._inflight)} computations in flight")
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._pool, batch_solve.solve_request, 0, options, instance)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        ok, line = await asyncio.shield(future)
+        out = json.loads(line)
+        if not ok:
+            raise ValueError(out['error'])
+        out.pop('index', None)
+        out['coalesced'] = coalesced
+        if downgraded:
+            out['downgraded'] = True
+            self.counts['downgraded'] += 1
+        return out
+
+    async def _reply(self, index, line, writer, received):
+        out = {'index': index}
+        self.counts['requests'] += 1
+        try:
+            req = json.loads(line)
+            if isinstance(req, dict) and 'id' in req:
+                out['id'] = req['id']
+            if isinstance(req, dict) and req.get('op') == 'stats':
+                out.update(self.stats())
+            else:
+                out.update(await self.solve(req))
+                self.counts['solved'] += 1
+        except Rejected as e:
+            out.update(error=str(e), rejected=True)
+            self.counts['rejected'] += 1
+        except Exception as e:
+            batch_solve.error_output(out, e)
+            self.counts['errors'] += 1
+        latency = time.monotonic() - received
+        out['latency'] = latency
+        self.latency.add(latency)
+        writer.write(json.dumps(out).encode() + b'\n')
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        tasks = set()
+        index = 0
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._reply(index, line, writer, time.monotonic()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                index += 1
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            # client gone, or a line longer than MAX_LINE
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+
+    async def start(self, unix=None, host='127.0.0.1', port=0):
+        """Starts listening; returns the asyncio server."""
+        if unix is not None:
+            if os.path.exists(unix):
+                os.unlink(unix)
+            server = await asyncio.start_unix_server(self._handle, path=unix, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        self._servers.append(server)
+        return server
+
+    def close(self):
+        for server in self._servers:
+            server.close()
+        self._pool.shutdown(cancel_futures=True)
+
+
+async def serve(args):
+    server = SolveServer(jobs=args.jobs, max_cost=args.max_cost, policy=args.policy, max_pending=args.max_pending)
+    # Start the workers (and their solver imports) before accepting requests
+    await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(server._pool, time.sleep, 0.01)
+                           for _ in range(server.jobs)))
+    listener = await server.start(unix=args.unix, host=args.host, port=args.port)
+    where = args.unix or ':'.join(map(str, listener.sockets[0].getsockname()[:2]))
+    print(f"Serving on {where} with {server.jobs} worker(s)", file=sys.stderr, flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # e.g. Windows: Ctrl+C raises KeyboardInterrupt instead
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(json.dumps(server.stats()), file=sys.stderr, flush=True)
+
+    reporter = asyncio.create_task(report()) if args.stats_interval else None
+    try:
+        await stop.wait()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        listener.close()
+        server.close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        print(json.dumps(server.stats()), file=sys.stderr)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Serve knapsack solves over a Unix socket or localhost TCP')
+    p.add_argument('--unix', default=None, help='Unix socket path to listen on (default: TCP)')
+    p.add_argument('--host', default='127.0.0.1', help='TCP host to listen on')
+    p.add_argument('--port', type=int, default=8765, help='TCP port to listen on (0: any free port)')
+    p.add_argument('--jobs', '-j', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    p.add_argument('--max-cost', type=int, default=MAX_COST,
+                   help=f'Predicted cost (DP cells) above which --policy applies (default {MAX_COST}; 0: no limit)')
+    p.add_argument('--policy', choices=['greedy', 'reject'], default='greedy',
+                   help='Admission control for instances over --max-cost: solve greedily or reject')
+    p.add_argument('--max-pending', type=int, default=MAX_PENDING,
+                   help='Distinct computations in flight before new requests are rejected')
+    p.add_argument('--stats-interval', type=float, default=0, help='Print the stats to stderr every this many seconds')
+    args = p.parse_args()
+    if args.max_cost == 0:
+        args.max_cost = None
+    return args
+
+
+def main():
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
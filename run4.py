@@ -1,27 +1,83 @@
 #!/usr/bin/env python3
 """
-Helper to run the DP implementation in `4.py` using an input JSON file.
+Helper to run the DP implementation in `4_pd_com_itens.py` using an input JSON file
+(or a binary instance, see knapsack_io.py). Solvers come from the registry
+(knapsack_registry.py), so only the module that is actually used is imported.
 
 Usage:
   python run4.py                 # uses input_5.json by default
   python run4.py input_5.json    # or pass a custom input file path
+  python run4.py input_32.json --solver core   # any registered solver that returns items
+
+  # Items with a count {"w", "v", "c"} are solved by the bounded DP
+  # (14_mochila_limitada.py), which reports the copies taken of each item;
+  # other solvers and --capacities see every copy as a separate item
+
+  # Batch mode: answer several capacities for the same items from one DP pass
+  # (uses 2_pd.knapsack_all_capacities; the file's own capacity is ignored)
+  python run4.py input_32.json --capacities 10,50,100
 """
 import sys
-import json
 import os
-import importlib.util
+import argparse
+
+import knapsack_io
+import knapsack_registry
+
+
+def parse_capacities(text):
+    caps = [int(c) for c in text.replace(',', ' ').split()]
+    if not caps or min(caps) < 0:
+        raise argparse.ArgumentTypeError('capacities must be non-negative integers')
+    return caps
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Run the knapsack DP with item reconstruction on a JSON input')
+    p.add_argument('input', nargs='?', default='input_5.json', help='Path to input JSON or binary instance file')
+    p.add_argument('--capacities', type=parse_capacities, default=None,
+                   help='Comma-separated capacities to solve from a single DP pass')
+    p.add_argument('--backend', choices=['python', 'numpy'], default='python',
+                   help='DP backend used by --capacities')
+    p.add_argument('--solver', choices=knapsack_registry.names(items=True), default=None,
+                   help='Registered solver that returns the chosen items (default: table_dp, 4_pd_com_itens.py, '
+                        'or bounded_dp when items have counts)')
+    return p.parse_args()
+
+
+def print_items(chosen, val, wt):
+    if chosen:
+        print('Chosen items (w,v):')
+        for idx in chosen:
+            print(f"  - idx={idx} w={wt[idx]} v={val[idx]}")
 
 
-def load_module_from_file(path, name='mod'):
-    spec = importlib.util.spec_from_file_location(name, path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+def run_capacities(caps, val, wt, backend):
+    mod2 = knapsack_registry.load('dp')
+
+    best, decisions = mod2.knapsack_all_capacities(max(caps), val, wt, keep_decisions=True, backend=backend)
+    for cap in caps:
+        chosen = mod2.backtrack(decisions, wt, cap)
+        print(f"capacity={cap}  max value: {best[cap]}  chosen item indices: {chosen}")
+
+
+def run_bounded(input_path, cap, val, wt, cnt):
+    spec = knapsack_registry.get('bounded_dp')
+    total, quantities = spec.load().knapsack_with_quantities(cap, val, wt, cnt)
+
+    print(f"Input: {os.path.basename(input_path)}  capacity={cap}  n_items={len(val)} ({sum(cnt)} copies)  "
+          f"solver={spec.name} ({spec.filename}, {spec.complexity})")
+    print(f"Max value: {total}")
+    print('Chosen quantities (w,v):')
+    for idx, q in enumerate(quantities):
+        if q:
+            print(f"  - idx={idx} w={wt[idx]} v={val[idx]} quantity={q}/{cnt[idx]}")
 
 
 def main():
+    args = parse_args()
     base = os.path.dirname(os.path.abspath(__file__))
-    input_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base, 'input_5.json')
+    input_path = args.input
 
     if not os.path.isabs(input_path):
         input_path = os.path.join(base, input_path)
@@ -30,36 +86,31 @@ def main():
         print(f"Input file not found: {input_path}")
         sys.exit(1)
 
-    # Load the 4.py implementation (module name mod4)
-    mod4_path = os.path.join(base, '4.py')
-    if not os.path.exists(mod4_path):
-        print(f"Implementation file not found: {mod4_path}")
-        sys.exit(1)
+    cap, val, wt, cnt = knapsack_io.read_instance(input_path, backend='list', counts=True)
+    bounded = any(c != 1 for c in cnt)
+    solver = args.solver or ('bounded_dp' if bounded else 'table_dp')
 
-    mod4 = load_module_from_file(mod4_path, name='mod4')
+    if bounded and solver == 'bounded_dp' and args.capacities is None:
+        run_bounded(input_path, cap, val, wt, cnt)
+        return
+    if bounded:
+        # 0/1 view: every copy is an item of its own
+        val, wt = [list(col) for col in knapsack_io.expand_counts(val, wt, cnt)]
 
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if args.capacities is not None:
+        print(f"Input: {os.path.basename(input_path)}  n_items={len(val)}  capacities={args.capacities}")
+        run_capacities(args.capacities, val, wt, args.backend)
+        return
 
-    cap = int(data.get('capacity', 0))
-    items = data.get('items', [])
-    val = [int(it['v']) for it in items]
-    wt = [int(it['w']) for it in items]
+    # Call the solver function that returns (total_value, chosen_indices)
+    spec = knapsack_registry.get(solver)
+    total, chosen = spec.function(with_items=True)(cap, val, wt)
 
-    # Call the DP function that returns (total_value, chosen_indices)
-    if not hasattr(mod4, 'knapsack_with_items'):
-        print('The module 4.py does not expose knapsack_with_items(cap, val, wt)')
-        sys.exit(1)
-
-    total, chosen = mod4.knapsack_with_items(cap, val, wt)
-
-    print(f"Input: {os.path.basename(input_path)}  capacity={cap}  n_items={len(items)}")
+    print(f"Input: {os.path.basename(input_path)}  capacity={cap}  n_items={len(val)}  "
+          f"solver={spec.name} ({spec.filename}, {spec.complexity})")
     print(f"Max value: {total}")
     print(f"Chosen item indices: {chosen}")
-    if chosen:
-        print('Chosen items (w,v):')
-        for idx in chosen:
-            print(f"  - idx={idx} w={wt[idx]} v={val[idx]}")
+    print_items(chosen, val, wt)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Load generator for the local solve server (knapsack_server.py).
+
+Opens `--concurrency` connections, each a closed-loop client that sends one
+instance, waits for the reply and sends the next, until `--requests`
+replies have arrived. Instances come from the scaling sweep families
+(scripts/scaling_sweep.py); `--distinct` draws every request at random
+(seeded by `--seed`) from a pool of that many instances, so repeated
+instances in flight together exercise the server's request coalescing.
+
+Reports throughput (replies per second), client-side latency percentiles,
+how many replies were coalesced, downgraded, rejected or failed, and the
+server's own stats (queue depth and latency histograms). With `--output`
+the summary is appended as one row to a CSV file.
+
+Usage:
+  python knapsack_server.py --unix /tmp/knapsack.sock &
+  python scripts/load_test.py --unix /tmp/knapsack.sock --requests 5000 --concurrency 32
+
+  # Start a server of its own on a temporary socket for the run
+  python scripts/load_test.py --spawn --jobs 4 --n 200 --capacity 10000 --distinct 50
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+# Project root (parent of scripts)
+ROOT = os.path.dirname(BASE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BASE)
+
+from scaling_sweep import FAMILIES, generate
+from knapsack_benchmark import percentile
+
+
+def make_requests(count, family, n, W, distinct=None, solver=None, seed=0):
+    """
+    JSON lines of `count` requests drawn at random (seeded by `seed`) from
+    `distinct` instances; all distinct by default.
+    """
+    pool = []
+    for k in range(distinct or count):
+        val, wt = generate(family, n, W, seed + k)
+        req = {'capacity': W, 'items': [{'w': w, 'v': v} for v, w in zip(val, wt)]}
+        if solver:
+            req['solver'] = solver
+        pool.append(json.dumps(req).encode() + b'\n')
+    if distinct is None:
+        return pool
+    # Random draws, so identical instances can be in flight together even
+    # with fewer distinct instances than concurrent clients
+    rng = random.Random(seed)
+    return [rng.choice(pool) for _ in range(count)]
+
+
+async def _connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix, limit=64 * 1024 * 1024)
+    return await asyncio.open_connection(args.host, args.port, limit=64 * 1024 * 1024)
+
+
+async def _client(args, lines, next_request, latencies, replies):
+    reader, writer = await _connect(args)
+    try:
+        while True:
+            k = next_request()
+            if k is None:
+                return
+            t0 = time.perf_counter()
+            writer.write(lines[k])
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('server closed the connection')
+            latencies.append(time.perf_counter() - t0)
+            replies.append(json.loads(line))
+    finally:
+        writer.close()
+
+
+async def _server_stats(args):
+    reader, writer = await _connect(args)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+
+async def run_load(args, lines):
+    """Sends every line with `args.concurrency` clients; returns the summary dict."""
+    issued = iter(range(len(lines)))
+    latencies, replies = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(args, lines, lambda: next(issued, None), latencies, replies)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = await _server_stats(args)
+
+    latencies.sort()
+    return {
+        'requests': len(replies),
+        'concurrency': args.concurrency,
+        'family': args.family,
+        'n': args.n,
+        'capacity': args.capacity,
+        'distinct': args.distinct or len(lines),
+        'elapsed': elapsed,
+        'throughput': len(replies) / elapsed if elapsed > 0 else float('inf'),
+        'p50': percentile(latencies, 0.5),
+        'p90': percentile(latencies, 0.9),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1] if latencies else None,
+        'coalesced': sum(1 for r in replies if r.get('coalesced')),
+        'downgraded': sum(1 for r in replies if r.get('downgraded')),
+        'rejected': sum(1 for r in replies if r.get('rejected')),
+        'errors': sum(1 for r in replies if 'error' in r and not r.get('rejected')),
+        'server': stats,
+    }
+
+
+def _spawn_server(args):
+    # Starts knapsack_server.py on a temporary Unix socket and waits for it
+    args.unix = os.path.join(tempfile.mkdtemp(), 'knapsack.sock')
+    cmd = [sys.executable, os.path.join(ROOT, 'knapsack_server.py'), '--unix', args.unix]
+    if args.jobs:
+        cmd += ['--jobs', str(args.jobs)]
+    cmd += args.server_args
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()
+    if not line.startswith('Serving'):
+        proc.kill()
+        raise RuntimeError(f"server failed to start: {line}{proc.stderr.read()}")
+    return proc
+
+
+def print_summary(summary):
+    ms = lambda s: f"{s * 1000:.2f} ms" if s is not None else '-'
+    print(f"{summary['requests']} request(s) in {summary['elapsed']:.3f}s with {summary['concurrency']} client(s): "
+          f"{summary['throughput']:.1f} requests/s")
+    print(f"latency p50 {ms(summary['p50'])}, p90 {ms(summary['p90'])}, p99 {ms(summary['p99'])}, "
+          f"max {ms(summary['max'])}")
+    print(f"coalesced {summary['coalesced']}, downgraded {summary['downgraded']}, "
+          f"rejected {summary['rejected']}, errors {summary['errors']}")
+    server = summary['server']
+    depth, latency = server['queue_depth'], server['request_latency']
+    print(f"server: queue depth p50 {depth['p50']}, p99 {depth['p99']}, max {depth['max']}; "
+          f"latency p50 {ms(latency['p50'])}, p99 {ms(latency['p99'])} (bucket bounds)")
+
+
+def save_summary_csv(path, summary):
+    row = {k: v for k, v in summary.items() if k != 'server'}
+    new = not os.path.exists(path)
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(row))
+        if new:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Measure throughput and latency of knapsack_server.py')
+    p.add_argument('--unix', default=None, help='Unix socket of the server (default: TCP)')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--spawn', action='store_true', help='Start a server on a temporary Unix socket for the run')
+    p.add_argument('--jobs', '-j', type=int, default=None, help='Worker processes of the spawned server')
+    p.add_argument('--server-args', nargs=argparse.REMAINDER, default=[],
+                   help='Remaining arguments are passed to the spawned server (e.g. --policy reject)')
+    p.add_argument('--requests', type=int, default=2000, help='Requests to send')
+    p.add_argument('--concurrency', '-c', type=int, default=16, help='Concurrent client connections')
+    p.add_argument('--family', choices=list(FAMILIES), default='uncorrelated')
+    p.add_argument('--n', type=int, default=50, help='Items per instance')
+    p.add_argument('--capacity', type=int, default=1000, help='Capacity of every instance')
+    p.add_argument('--distinct', type=int, default=None, help='Draw the requests from this many distinct instances')
+    p.add_argument('--solver', default=None, help='Solver requested for every instance (default: server choice)')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--output', default=None, help='CSV file to append the summary row to')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    lines = make_requests(args.requests, args.family, args.n, args.capacity, args.distinct, args.solver, args.seed)
+    proc = _spawn_server(args) if args.spawn else None
+    try:
+        summary = asyncio.run(run_load(args, lines))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    print_summary(summary)
+    if args.output:
+        save_summary_csv(args.output, summary)
+
+
+if __name__ == '__main__':
+    main()
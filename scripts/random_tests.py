@@ -1,45 +1,36 @@
 #!/usr/bin/env python3
 """
-Randomized tests runner for knapsack implementations in `src/`.
-Generates instances and runs implementations: 1_brutalF (small n), 2_pd, 3_greed, 4_pd_com_itens.
+Randomized tests runner for knapsack implementations in the solver registry
+(knapsack_registry.py). Generates instances and runs implementations:
+1_brutalF (small n), 2_pd, 3_greed, 4_pd_com_itens, 9_core. Exact
+implementations are checked against 4_pd_com_itens; on the zero-weight /
+zero-capacity edge cases, 8_fptas is checked against its (1 - eps) guarantee.
 Saves results to `scripts/random_results.csv` and prints a short summary.
+Times and operation counts come from `knapsack_instrument.run` (counts are
+added in bulk by each solver, so they barely affect the timings).
 """
-import random, time, csv, os, importlib.util
+import random, csv, os, sys
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 # Project root (parent of scripts)
 ROOT = os.path.dirname(BASE)
-SRC = os.path.join(ROOT, 'src')
-OUT = os.path.join(BASE, 'random_results.csv')
+sys.path.insert(0, ROOT)
 
-# Helper to load module by path
-def load_module(path, name):
-    spec = importlib.util.spec_from_file_location(name, path)
-    m = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(m)
-    return m
+import knapsack_registry
+from knapsack_instrument import run
+OUT = os.path.join(BASE, 'random_results.csv')
 
-mods = {}
-# Expected files in src
-candidates = {
-    'impl_1': [os.path.join(SRC, '1_brutalF.py'), os.path.join(ROOT, '1_brutalF.py')],
-    'impl_2': [os.path.join(SRC, '2_pd.py'), os.path.join(ROOT, '2_pd.py')],
-    'impl_3': [os.path.join(SRC, '3_greed.py'), os.path.join(ROOT, '3_greed.py')],
-    'impl_4': [os.path.join(SRC, '4_pd_com_itens.py'), os.path.join(ROOT, '4_pd_com_itens.py')],
-}
+# Registered solvers under test; impl_4 returns the chosen items and is the reference
+specs = {spec.impl: spec for spec in map(knapsack_registry.get, ['brute_force', 'dp', 'greedy', 'table_dp', 'core'])}
+# Implementations whose results must match impl_4 exactly
+EXACT = [impl for impl, spec in specs.items() if spec.exact and impl != 'impl_4']
 
-for k, paths in candidates.items():
-    loaded = False
-    for p in paths:
-        if os.path.exists(p):
-            try:
-                mods[k] = load_module(p, k)
-                loaded = True
-                break
-            except Exception as e:
-                print('Failed to load', p, e)
-    if not loaded:
-        print('Module not found for', k, 'checked paths:', paths)
+fns = {}
+for k, spec in specs.items():
+    try:
+        fns[k] = spec.function(with_items=(k == 'impl_4'))
+    except Exception as e:
+        print('Failed to load', spec.filename, e)
 
 # Test parameters
 ns = [8, 12, 16, 20, 24]
@@ -59,21 +50,14 @@ for n in ns:
         val = [it['v'] for it in items]
         wt = [it['w'] for it in items]
 
-        for impl_name, mod in mods.items():
+        for impl_name, fn in fns.items():
             rec = {'impl': impl_name, 'n': n, 'capacity': capacity, 'status': 'ok', 'time': None, 'result': None, 'ops': 0, 'error': ''}
             try:
-                t0 = time.perf_counter()
-                # impl_4 has knapsack_with_items; others return int
-                if impl_name == 'impl_4' and hasattr(mod, 'knapsack_with_items'):
-                    res = mod.knapsack_with_items(capacity, val, wt)[0]
-                else:
-                    res = mod.knapsack(capacity, val, wt)
-                t1 = time.perf_counter()
-                rec['time'] = t1 - t0
-                rec['result'] = int(res)
-                # Capture operations count if available
-                if hasattr(mod, 'OPS'):
-                    rec['ops'] = mod.OPS
+                # impl_4 returns (value, chosen); the others an int
+                res = run(fn, capacity, val, wt)
+                rec['time'] = res.time
+                rec['result'] = int(res.value)
+                rec['ops'] = res.ops
             except RecursionError as re:
                 rec['status'] = 'recursion_error'
                 rec['error'] = str(re)
@@ -94,6 +78,7 @@ with open(OUT, 'w', newline='', encoding='utf-8') as f:
         w.writerow(row)
 
 print('Wrote', OUT)
+print('Module import times:', ', '.join(f"{f}={t * 1000:.1f}ms" for f, t in knapsack_registry.load_times().items()))
 # Quick summary: for each n, compare impl_3 vs impl_4 results (gap)
 import math
 from collections import defaultdict
@@ -124,11 +109,59 @@ for n, recs in sorted(by_n.items()):
         except Exception:
             pass
     avg_gap = sum(gaps)/len(gaps) if gaps else None
+
+    # exact implementations must agree with impl_4 on every repetition
+    mismatches = {}
+    for impl in EXACT:
+        if impl in res_by_impl and 'impl_4' in res_by_impl:
+            bad = sum(1 for a, b in zip(res_by_impl[impl], res_by_impl['impl_4']) if a != b)
+            if bad:
+                mismatches[impl] = bad
     
     print(f'n={n}:')
     for impl in sorted(avg_times):
         print(f"  {impl}: time={avg_times[impl]:.4f}s, ops={avg_ops[impl]:.1f}")
     if avg_gap is not None:
         print(f"  avg_gap={avg_gap:.2f}")
+    for impl, bad in sorted(mismatches.items()):
+        print(f"  MISMATCH {impl} vs impl_4: {bad}/{reps} instance(s)")
+
+# Edge cases: zero capacity and zero-weight items (which still fit when the
+# remaining capacity is 0); every exact engine must agree with impl_4
+edge_cases = [(5, [10, 1], [0, 5]), (0, [10], [0]), (0, [10, 3], [0, 1]), (3, [4, 0, 7, 2], [0, 0, 3, 1]),
+              (0, [10] * 4, [0] * 4)]
+for _ in range(20):
+    n = random.randint(1, 12)
+    wt = [random.choice([0, random.randint(1, max_weight)]) for _ in range(n)]
+    val = [random.randint(1, max_value) for _ in range(n)]
+    edge_cases.append((random.randint(0, sum(wt) // 2), val, wt))
+
+brute = specs['impl_1'].load()
+engines = {impl: fns[impl] for impl in EXACT if impl in fns}
+engines.update({f"impl_1[{mode}]": (lambda W, val, wt, mode=mode: brute.knapsack(W, val, wt, mode=mode))
+                for mode in ('naive', 'memo', 'bb')})
+edge_bad = defaultdict(int)
+for W, val, wt in edge_cases:
+    expected = fns['impl_4'](W, val, wt)[0]
+    for impl, fn in engines.items():
+        if fn(W, val, wt) != expected:
+            edge_bad[impl] += 1
+print(f'\nEdge cases (zero weights / zero capacity): {len(edge_cases)} instance(s)')
+for impl, bad in sorted(edge_bad.items()):
+    print(f"  MISMATCH {impl} vs impl_4: {bad}/{len(edge_cases)} instance(s)")
+
+# The FPTAS must stay within (1 - eps) of the optimum and report a valid
+# upper bound on the same instances
+fptas = knapsack_registry.load('fptas')
+eps = 0.1
+fptas_bad = 0
+for W, val, wt in edge_cases:
+    expected = fns['impl_4'](W, val, wt)[0]
+    res = fptas.knapsack_fptas(W, val, wt, eps=eps)
+    if (res['value'] < (1 - eps) * expected or res['upper_bound'] < expected
+            or sum(wt[i] for i in res['chosen']) > W):
+        fptas_bad += 1
+if fptas_bad:
+    print(f"  FPTAS GUARANTEE VIOLATED (eps={eps}): {fptas_bad}/{len(edge_cases)} instance(s)")
 
 print('\nDone')
\ No newline at end of file
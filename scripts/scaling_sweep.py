@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Scaling sweep for every registered knapsack implementation.
+
+Generates the standard hard instance families (Pisinger) over a grid of
+item counts n and capacities W, runs each implementation listed in
+`knapsack_benchmark.IMPLEMENTATIONS` in isolated workers with a hard per-run
+timeout, and writes:
+
+- `scripts/scaling_results.csv`: one tidy row per (family, impl, n, W) run
+- `scripts/scaling_fits.csv`: fitted growth models per (family, impl):
+  power law  t ~ a * n^p * W^q  (least squares on ln t, ln n, ln W) and
+  exponential t ~ a * b^n (the model of compute_fit.py / build_section2.py)
+
+Each family has a wall-clock budget; once an implementation times out or
+fails at (n, W), it is skipped for every larger (n', W') of that family.
+
+Usage:
+  python scripts/scaling_sweep.py
+  python scripts/scaling_sweep.py --families uncorrelated strongly_correlated --ns 10 100 1000 --ws 100 10000
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+# Project root (parent of scripts)
+ROOT = os.path.dirname(BASE)
+sys.path.insert(0, ROOT)
+
+import knapsack_benchmark as kb
+
+OUT = os.path.join(BASE, 'scaling_results.csv')
+FITS_OUT = os.path.join(BASE, 'scaling_fits.csv')
+
+
+def _coefficient_range(n, W):
+    # Choose the coefficient range R so that the items weigh about 2W in total
+    return max(10, (4 * W) // max(n, 1))
+
+
+def gen_uncorrelated(n, R, rng):
+    wt = [rng.randint(1, R) for _ in range(n)]
+    val = [rng.randint(1, R) for _ in range(n)]
+    return val, wt
+
+
+def gen_weakly_correlated(n, R, rng):
+    wt = [rng.randint(1, R) for _ in range(n)]
+    val = [max(1, w + rng.randint(-(R // 10), R // 10)) for w in wt]
+    return val, wt
+
+
+def gen_strongly_correlated(n, R, rng):
+    wt = [rng.randint(1, R) for _ in range(n)]
+    val = [w + R // 10 for w in wt]
+    return val, wt
+
+
+def gen_inverse_strongly_correlated(n, R, rng):
+    val = [rng.randint(1, R) for _ in range(n)]
+    wt = [v + R // 10 for v in val]
+    return val, wt
+
+
+def gen_subset_sum(n, R, rng):
+    wt = [rng.randint(1, R) for _ in range(n)]
+    return list(wt), wt
+
+
+def gen_spanner(n, R, rng, spanners=2, multiplier=10):
+    # Pisinger's spanner instances: a few strongly correlated "spanner" items
+    # scaled down by 2/m; every item is a random multiple a in [1, m] of one
+    base_val, base_wt = gen_strongly_correlated(spanners, R, rng)
+    base = [(math.ceil(2 * w / multiplier), math.ceil(2 * v / multiplier)) for v, w in zip(base_val, base_wt)]
+    val, wt = [], []
+    for _ in range(n):
+        w, v = rng.choice(base)
+        a = rng.randint(1, multiplier)
+        wt.append(a * w)
+        val.append(a * v)
+    return val, wt
+
+
+FAMILIES = {
+    'uncorrelated': gen_uncorrelated,
+    'weakly_correlated': gen_weakly_correlated,
+    'strongly_correlated': gen_strongly_correlated,
+    'inverse_strongly_correlated': gen_inverse_strongly_correlated,
+    'subset_sum': gen_subset_sum,
+    'spanner': gen_spanner,
+}
+
+
+def generate(family, n, W, seed):
+    rng = random.Random(seed)
+    return FAMILIES[family](n, _coefficient_range(n, W), rng)
+
+
+def _lstsq(rows, ys):
+    # Solve the normal equations (X^T X) beta = X^T y by Gaussian elimination
+    k = len(rows[0])
+    A = [[sum(r[i] * r[j] for r in rows) for j in range(k)] for i in range(k)]
+    b = [sum(r[i] * y for r, y in zip(rows, ys)) for i in range(k)]
+    for col in range(k):
+        pivot = max(range(col, k), key=lambda r: abs(A[r][col]))
+        if abs(A[pivot][col]) < 1e-12:
+            return None
+        A[col], A[pivot] = A[pivot], A[col]
+        b[col], b[pivot] = b[pivot], b[col]
+        for r in range(k):
+            if r != col:
+                f = A[r][col] / A[col][col]
+                A[r] = [x - f * y for x, y in zip(A[r], A[col])]
+                b[r] -= f * b[col]
+    beta = [b[i] / A[i][i] for i in range(k)]
+    pred = [sum(c * x for c, x in zip(beta, r)) for r in rows]
+    mean = sum(ys) / len(ys)
+    ss_tot = sum((y - mean) ** 2 for y in ys)
+    ss_res = sum((y - p) ** 2 for y, p in zip(ys, pred))
+    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 1.0
+    return beta, r2
+
+
+def fit_models(points):
+    """
+    points: list of (n, W, t). Returns a dict with the power-law exponents
+    (exp_n, exp_w; exp_w is omitted when W does not vary) and the
+    exponential base b of t ~ a * b^n, each with its R^2.
+    """
+    pts = [(n, W, t) for n, W, t in points if t > 0]
+    fit = {'points': len(pts)}
+    if len(pts) < 2:
+        return fit
+    ys = [math.log(t) for _, _, t in pts]
+    vary_n = len({n for n, _, _ in pts}) > 1
+    vary_w = len({W for _, W, _ in pts}) > 1
+
+    cols = []
+    if vary_n:
+        cols.append(lambda n, W: math.log(n))
+    if vary_w:
+        cols.append(lambda n, W: math.log(W))
+    if cols and len(pts) > len(cols):
+        res = _lstsq([[1.0] + [c(n, W) for c in cols] for n, W, _ in pts], ys)
+        if res is not None:
+            beta, r2 = res
+            names = (['exp_n'] if vary_n else []) + (['exp_w'] if vary_w else [])
+            for name, value in zip(names, beta[1:]):
+                fit[name] = value
+            fit['r2_power'] = r2
+
+    if vary_n:
+        res = _lstsq([[1.0, float(n)] for n, _, _ in pts], ys)
+        if res is not None:
+            beta, r2 = res
+            fit['exp_base'] = math.exp(beta[1])
+            fit['r2_exp'] = r2
+    return fit
+
+
+def sweep(impls, families, ns, ws, timeout, budget, jobs, seed, timing, memory_limit_mb):
+    rows = []
+    grid = sorted(((n, W) for n in ns for W in ws), key=lambda p: (p[0] * p[1], p))
+    for family in families:
+        started = time.monotonic()
+        failed = {}  # impl -> list of (n, W) where it timed out or failed
+        for n, W in grid:
+            if time.monotonic() - started > budget:
+                print(f"[{family}] budget of {budget}s exhausted; skipping larger sizes")
+                break
+            active = [impl for impl in impls
+                      if not any(n >= n0 and W >= W0 for n0, W0 in failed.get(impl[0], []))]
+            if not active:
+                break
+            # str seeds are hashed deterministically by random.Random
+            instance_seed = random.Random(f"{seed}/{family}/{n}/{W}").getrandbits(32)
+            val, wt = generate(family, n, W, instance_seed)
+            print(f"[{family}] n={n} W={W}: {len(active)} implementation(s)")
+            tasks = kb.make_tasks(active, W, val, wt, input_name=f"{family}/n={n}/W={W}", timing=timing,
+                                  memory_limit_mb=memory_limit_mb)
+            for rec in kb.run_tasks(tasks, timeout=timeout, jobs=jobs):
+                if rec['status'] != 'ok':
+                    failed.setdefault(rec['impl'], []).append((n, W))
+                rows.append({'family': family, 'impl': rec['impl'], 'n': n, 'capacity': W, 'seed': instance_seed,
+                             'status': rec['status'], 'time': rec['time'], 'time_min': rec.get('time_min'),
+                             'reps': rec.get('reps'), 'result': rec['result'], 'peak_rss_kb': rec['peak_rss_kb']})
+    return rows
+
+
+def write_csv(path, rows, keys):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=keys)
+        w.writeheader()
+        for row in rows:
+            w.writerow({k: row.get(k, '') for k in keys})
+    print('Wrote', path)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Scaling sweep over n, W and instance families')
+    p.add_argument('--families', nargs='+', default=list(FAMILIES), choices=list(FAMILIES))
+    p.add_argument('--ns', nargs='+', type=int, default=[10, 20, 30, 100, 1000, 10000, 100000, 1000000])
+    p.add_argument('--ws', nargs='+', type=int, default=[100, 10000, 1000000])
+    p.add_argument('--impls', nargs='+', default=None, help='Implementation names to run (default: all)')
+    p.add_argument('--timeout', type=float, default=10.0, help='Hard timeout per run (seconds)')
+    p.add_argument('--budget', type=float, default=300.0, help='Wall-clock budget per family (seconds)')
+    p.add_argument('--jobs', '-j', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    p.add_argument('--memory-limit', type=int, default=4096, help='Per-worker address-space limit in MB')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--output', default=OUT)
+    p.add_argument('--fits-output', default=FITS_OUT)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    impls = kb.load_implementations(ROOT)
+    if args.impls:
+        impls = [impl for impl in impls if impl[0] in args.impls]
+    # A sweep needs many points more than many repetitions per point
+    timing = {'warmup': 0, 'min_reps': 1, 'max_reps': 5, 'time_budget': 0.5}
+
+    rows = sweep(impls, args.families, args.ns, args.ws, args.timeout, args.budget, args.jobs, args.seed,
+                 timing, args.memory_limit)
+    write_csv(args.output, rows,
+              ['family', 'impl', 'n', 'capacity', 'seed', 'status', 'time', 'time_min', 'reps', 'result', 'peak_rss_kb'])
+
+    fits = []
+    for family in args.families:
+        for name, _, _, _ in impls:
+            points = [(r['n'], r['capacity'], r['time']) for r in rows
+                      if r['family'] == family and r['impl'] == name and r['status'] == 'ok']
+            fit = fit_models(points)
+            fit.update({'family': family, 'impl': name})
+            fits.append(fit)
+            if 'exp_n' in fit or 'exp_w' in fit:
+                print(f"{family:28s} {name:8s} t ~ n^{fit.get('exp_n', 0):.2f} * W^{fit.get('exp_w', 0):.2f}"
+                      f" (R^2={fit['r2_power']:.3f}, {fit['points']} points)")
+    write_csv(args.fits_output, fits,
+              ['family', 'impl', 'points', 'exp_n', 'exp_w', 'r2_power', 'exp_base', 'r2_exp'])
+
+
+if __name__ == '__main__':
+    main()